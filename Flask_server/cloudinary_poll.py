@@ -0,0 +1,151 @@
+import threading
+import cloudinary.api
+import cloudinary.uploader
+from metrics import VIDEOS_PROCESSED
+
+SIGN_TO_TEXT_PREFIX = "sign-to-text/"
+# Uploads given up on are moved here, out of the polled folder
+FAILED_UPLOADS_PREFIX = "sign-to-text-failed/"
+
+class UploadWatermark:
+    """
+    High-water mark on `created_at` for uploads already handled.
+
+    Cloudinary timestamps only have second resolution, so the public IDs
+    seen at exactly the mark are remembered too; another upload in that same
+    second is still picked up.
+    """
+
+    def __init__(self):
+        self.created_at = None
+        self.public_ids = set()
+        self._lock = threading.Lock()
+
+    def is_new(self, resource):
+        with self._lock:
+            if self.created_at is None or resource["created_at"] > self.created_at:
+                return True
+            return resource["created_at"] == self.created_at and resource["public_id"] not in self.public_ids
+
+    def advance(self, resource):
+        with self._lock:
+            if self.created_at is None or resource["created_at"] > self.created_at:
+                self.created_at = resource["created_at"]
+                self.public_ids = {resource["public_id"]}
+            elif resource["created_at"] == self.created_at:
+                self.public_ids.add(resource["public_id"])
+
+    def state(self):
+        with self._lock:
+            return {"created_at": self.created_at, "ids_at_mark": len(self.public_ids)}
+
+def list_new_uploads(watermark, prefix=SIGN_TO_TEXT_PREFIX, page_size=100, resource_type="video"):
+    """
+    List uploads under `prefix` newer than the watermark, oldest first.
+
+    The Admin API ignores `direction` when a prefix is given and orders by
+    public_id, so no page says anything about the next one: every page is
+    fetched with `next_cursor` and filtered against the mark. Handled
+    uploads are deleted and given-up ones moved out of the folder, so the
+    listing stays short and a poll with nothing new costs a single call.
+    Returns (resources, pages fetched).
+    """
+    new, cursor, pages = [], None, 0
+    while True:
+        params = {"resource_type": resource_type, "type": "upload", "prefix": prefix, "max_results": page_size}
+        if cursor:
+            params["next_cursor"] = cursor
+        result = cloudinary.api.resources(**params)
+        pages += 1
+        new.extend(resource for resource in result.get("resources", []) if watermark.is_new(resource))
+
+        cursor = result.get("next_cursor")
+        if not cursor:
+            break
+
+    new.sort(key=lambda resource: (resource["created_at"], resource["public_id"]))
+    return new, pages
+
+class RetryCounter:
+    """Failed attempts per public_id; an upload is given up on after `max_attempts`."""
+
+    def __init__(self, max_attempts=3):
+        self.max_attempts = max_attempts
+        self._failures = {}
+
+    def failed(self, public_id):
+        """Count a failure; True once the upload has used up its attempts."""
+        self._failures[public_id] = self._failures.get(public_id, 0) + 1
+        if self._failures[public_id] < self.max_attempts:
+            return False
+        del self._failures[public_id]
+        return True
+
+    def succeeded(self, public_id):
+        self._failures.pop(public_id, None)
+
+def set_aside(resource, prefix=SIGN_TO_TEXT_PREFIX, failed_prefix=FAILED_UPLOADS_PREFIX):
+    """Move an upload from `prefix` to `failed_prefix`, so later polls neither list nor retry it."""
+    public_id = resource["public_id"]
+    target = failed_prefix + public_id[len(prefix):] if public_id.startswith(prefix) else failed_prefix + public_id
+    cloudinary.uploader.rename(public_id, target, resource_type=resource.get("resource_type", "video"), overwrite=True)
+    return target
+
+def process_new_uploads(pending, watermark, retries, process, prefix=SIGN_TO_TEXT_PREFIX):
+    """
+    Run process(resource) -> bool over listed uploads, oldest first.
+
+    The watermark only moves past an unbroken run of uploads that were
+    handled or given up on, so a failed upload is listed and retried on the
+    next poll, at most `retries.max_attempts` times in all. A given-up upload
+    is then moved out of `prefix` with set_aside(). Returns the number
+    handled successfully; a stuck failure counts as no activity, so it cannot
+    hold the poll interval at its minimum.
+    """
+    handled, in_order = 0, True
+    for resource in pending:
+        public_id = resource["public_id"]
+        try:
+            ok = process(resource)
+        except Exception as e:
+            print(f"Error processing {public_id}: {str(e)}")
+            ok = False
+
+        if ok:
+            retries.succeeded(public_id)
+            handled += 1
+        elif retries.failed(public_id):
+            print(f"Giving up on {public_id} after {retries.max_attempts} failed attempts")
+            VIDEOS_PROCESSED.inc(result="abandoned")
+            try:
+                print(f"Moved {public_id} to {set_aside(resource, prefix)}")
+            except Exception as e:
+                # The watermark still skips it until a restart
+                print(f"Error moving {public_id} out of {prefix}: {str(e)}")
+            ok = True  # Let the watermark move past it
+        if ok and in_order:
+            watermark.advance(resource)
+        else:
+            in_order = False
+    return handled
+
+class AdaptiveInterval:
+    """Poll interval that drops to `min_seconds` while uploads arrive and doubles (up to `max_seconds`) while idle."""
+
+    def __init__(self, min_seconds=10.0, max_seconds=60.0, backoff=2.0):
+        self.min_seconds = min_seconds
+        self.max_seconds = max_seconds
+        self.backoff = backoff
+        self.seconds = min_seconds
+
+    def record(self, found):
+        """Update after a poll and return the next interval."""
+        if found:
+            self.seconds = self.min_seconds
+        else:
+            self.seconds = min(self.max_seconds, self.seconds * self.backoff)
+        return self.seconds
+
+    def reset(self):
+        self.seconds = self.min_seconds
+        return self.seconds
@@ -1,15 +1,25 @@
-import os
 import time
+
+# Taken before any other import so the readiness report covers the full cold start
+SERVER_IMPORT_STARTED = time.perf_counter()
+
+import os
+import uuid
+import threading
+from collections import OrderedDict
 import requests
 import cloudinary
 import cloudinary.api
 import cloudinary.uploader
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, g, Response
 from apscheduler.schedulers.background import BackgroundScheduler
 from dotenv import load_dotenv
-from sign_to_text import video_to_text
 from flask_cors import CORS
-from text_to_sign import generate_sentence_video
+from spool import VideoSpool, PROCESSED, FAILED
+from cloudinary_poll import (UploadWatermark, RetryCounter, AdaptiveInterval, list_new_uploads, process_new_uploads,
+                             SIGN_TO_TEXT_PREFIX)
+from warmup import sign_pipeline, text_pipeline, start_background_warmup, readiness
+from metrics import stage_timer, render_prometheus, HTTP_SECONDS, IN_FLIGHT, QUEUE_DEPTH, VIDEOS_PROCESSED, POLL_INTERVAL
 
 # Load environment variables from .env file
 load_dotenv()
@@ -24,76 +34,197 @@ cloudinary.config(
     api_secret=os.getenv("CLOUDINARY_API_SECRET")
 )
 
-# Create temp_videos directory if it doesn't exist
+# Optional API base URL override, e.g. the local fake in loadtest/fake_cloudinary.py
+if os.getenv("CLOUDINARY_UPLOAD_PREFIX"):
+    cloudinary.config(upload_prefix=os.getenv("CLOUDINARY_UPLOAD_PREFIX"))
+
+# Downloaded videos live in a bounded spool; processed clips are evicted by size and age
 TEMP_VIDEOS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'temp_videos')
-os.makedirs(TEMP_VIDEOS_DIR, exist_ok=True)
+spool = VideoSpool(
+    TEMP_VIDEOS_DIR,
+    max_bytes=int(os.getenv("SPOOL_MAX_BYTES", 1024 ** 3)),
+    max_age_seconds=float(os.getenv("SPOOL_MAX_AGE_SECONDS", 24 * 3600)),
+)
+
+# Model used for sign-to-text; point these at the distilled student for CPU serving
+MODEL_PATH = os.getenv("SIGN_MODEL_PATH", "sign_language_model.pth")
+LABEL_ENCODER_PATH = os.getenv("SIGN_LABEL_ENCODER_PATH", "label_encoder.pkl")
+# "uniform" or "adaptive" (motion-aware). Adaptive keeps 16 frames unless SIGN_ADAPTIVE_MIN_FRAMES
+# is set, which shortens mostly-still clips; check bench_sampling.py accuracy before enabling it
+FRAME_SAMPLER = os.getenv("SIGN_FRAME_SAMPLER", "uniform")
+ADAPTIVE_MIN_FRAMES = int(os.getenv("SIGN_ADAPTIVE_MIN_FRAMES", 0)) or None
+DATASET_PATH = "Python_AI/Example_videos"
+
+# Batch sizes to run a dummy forward pass at during warmup, e.g. "1,4"
+WARMUP_BATCH_SIZES = [int(b) for b in os.getenv("WARMUP_BATCH_SIZES", "1").split(",") if b.strip()]
+# Every clip length inference can see, so the first short clip does not pay kernel setup
+WARMUP_FRAME_COUNTS = [16] + ([ADAPTIVE_MIN_FRAMES] if FRAME_SAMPLER == "adaptive" and ADAPTIVE_MIN_FRAMES else [])
+
+# Cloudinary polling: listing page size, download attempts per upload and the bounds the poll
+# interval adapts between. The Admin API is rate limited per hour (500 by default), so keep the
+# minimum interval at 10s or more.
+POLL_PAGE_SIZE = int(os.getenv("CLOUDINARY_POLL_PAGE_SIZE", 100))
+# Seconds to wait for the video download to connect and between received bytes
+DOWNLOAD_TIMEOUT_SECONDS = float(os.getenv("CLOUDINARY_DOWNLOAD_TIMEOUT_SECONDS", 30))
+POLL_JOB_ID = "cloudinary_poll"
+upload_watermark = UploadWatermark()
+upload_retries = RetryCounter(max_attempts=int(os.getenv("CLOUDINARY_POLL_MAX_ATTEMPTS", 3)))
+poll_interval = AdaptiveInterval(
+    min_seconds=float(os.getenv("CLOUDINARY_POLL_MIN_SECONDS", 10)),
+    max_seconds=float(os.getenv("CLOUDINARY_POLL_MAX_SECONDS", 60)),
+)
+poll_lock = threading.Lock()
 
 # Global variable to store the latest sign text result
 latest_sign_text = ""
 latest_video_id = ""
 
-def check_and_download_videos():
+# Recent results by public_id, oldest first, so concurrent uploaders can each find their own
+RECENT_TRANSLATIONS_MAX = int(os.getenv("RECENT_TRANSLATIONS_MAX", 1000))
+recent_translations = OrderedDict()
+recent_translations_lock = threading.Lock()
+
+def record_translation(public_id, text, result):
+    """Keep the result of one upload for GET /translation/<public_id>, dropping the oldest past the limit."""
+    with recent_translations_lock:
+        recent_translations.pop(public_id, None)
+        recent_translations[public_id] = {"text": text, "result": result, "timestamp": time.time()}
+        while len(recent_translations) > RECENT_TRANSLATIONS_MAX:
+            recent_translations.popitem(last=False)
+
+def process_sign_upload(resource):
+    """Download one sign-to-text upload, delete it from Cloudinary and translate it. Returns False if the download failed."""
+    global latest_sign_text, latest_video_id
+
+    video_url = resource['secure_url']
+    public_id = resource['public_id']
+    format_extension = resource['format']
+
+    # Extract just the filename without folder structure for local storage
+    base_filename = public_id.split('/')[-1]
+
+    # Create a filename for the downloaded video
+    filename = f"{base_filename}.{format_extension}"
+    local_path = spool.path(filename)
+
+    # Download the video
+    print(f"Downloading {filename} from sign-to-text folder...")
+    IN_FLIGHT.inc(kind="video")
+    try:
+        with stage_timer("download"):
+            response = requests.get(video_url, timeout=DOWNLOAD_TIMEOUT_SECONDS)
+        if response.status_code != 200:
+            print(f"Failed to download {filename}: HTTP {response.status_code}")
+            VIDEOS_PROCESSED.inc(result="download_failed")
+            return False
+
+        with open(local_path, 'wb') as f:
+            f.write(response.content)
+        spool.add(filename)
+        print(f"Successfully downloaded {filename} to {local_path}")
+
+        try:
+            # Delete the video from Cloudinary
+            with stage_timer("cloudinary_destroy"):
+                cloudinary.uploader.destroy(public_id, resource_type="video")
+            print(f"Deleted {filename} from Cloudinary")
+
+            # Use the full path when calling video_to_text
+            sign_text = sign_pipeline().video_to_text(local_path, MODEL_PATH, LABEL_ENCODER_PATH, sampler=FRAME_SAMPLER, min_frames=ADAPTIVE_MIN_FRAMES)
+            print(f"Prediction result: {sign_text}")
+        except Exception as e:
+            # A pending clip is never evicted, so don't leave it pending until a restart
+            spool.mark(filename, FAILED)
+            VIDEOS_PROCESSED.inc(result="error")
+            record_translation(public_id, f"ERROR: {e}", "error")
+            raise
+        failed = sign_text.startswith("ERROR")
+        spool.mark(filename, FAILED if failed else PROCESSED)
+        VIDEOS_PROCESSED.inc(result="error" if failed else "ok")
+        record_translation(public_id, sign_text, "error" if failed else "ok")
+
+        # Update the latest prediction result
+        latest_sign_text = sign_text
+        latest_video_id = public_id
+        return True
+    finally:
+        IN_FLIGHT.dec(kind="video")
+        QUEUE_DEPTH.dec(queue="sign_to_text")
+
+def check_and_download_videos(wait=True):
     """
     Check Cloudinary for new videos, download them, and delete them from Cloudinary.
-    Only processes videos in the sign-to-text folder.
+    Only lists the sign-to-text folder, keeps what is past the last poll's
+    high-water mark, and processes it oldest first.
+    Returns the number of videos handled successfully, or None if another poll
+    was running and `wait` is False.
     """
-    global latest_sign_text, latest_video_id
-    
+    # The scheduler, webhook and /trigger-check all poll; one at a time keeps the watermark consistent
+    if not poll_lock.acquire(blocking=wait):
+        return None
     try:
-        # Get list of videos from Cloudinary
-        result = cloudinary.api.resources(resource_type="video", max_results=30)
-        
-        if not result.get('resources'):
-            return
-        
-        print(f"Found {len(result['resources'])} videos in Cloudinary")
-        
-        # Process each video
-        for resource in result['resources']:
-            video_url = resource['secure_url']
-            public_id = resource['public_id']
-            format_extension = resource['format']
-            
-            # Only process videos in the sign-to-text folder
-            if not public_id.startswith('sign-to-text/'):
-                print(f"Skipping video not in sign-to-text folder: {public_id}")
-                continue
-            
-            # Extract just the filename without folder structure for local storage
-            base_filename = public_id.split('/')[-1]
-            
-            # Create a filename for the downloaded video
-            filename = f"{base_filename}.{format_extension}"
-            local_path = os.path.join(TEMP_VIDEOS_DIR, filename)
-            
-            # Download the video
-            print(f"Downloading {filename} from sign-to-text folder...")
-            response = requests.get(video_url)
-            if response.status_code == 200:
-                with open(local_path, 'wb') as f:
-                    f.write(response.content)
-                print(f"Successfully downloaded {filename} to {local_path}")
-                
-                # Delete the video from Cloudinary
-                cloudinary.uploader.destroy(public_id, resource_type="video")
-                print(f"Deleted {filename} from Cloudinary")
-                
-                # Use the full path when calling video_to_text
-                sign_text = video_to_text(local_path)
-                print(f"Prediction result: {sign_text}")
-                
-                # Update the latest prediction result
-                latest_sign_text = sign_text
-                latest_video_id = public_id
-            else:
-                print(f"Failed to download {filename}: HTTP {response.status_code}")
-    except Exception as e:
-        print(f"Error checking and downloading videos: {str(e)}")
+        try:
+            with stage_timer("cloudinary_list"):
+                pending, pages = list_new_uploads(upload_watermark, SIGN_TO_TEXT_PREFIX, POLL_PAGE_SIZE)
+        except Exception as e:
+            print(f"Error checking and downloading videos: {str(e)}")
+            return 0
+
+        QUEUE_DEPTH.set(len(pending), queue="sign_to_text")
+        if not pending:
+            return 0
+        print(f"Found {len(pending)} new videos in sign-to-text ({pages} page(s) listed)")
+        return process_new_uploads(pending, upload_watermark, upload_retries, process_sign_upload, SIGN_TO_TEXT_PREFIX)
+    finally:
+        poll_lock.release()
+
+def reschedule_poll(seconds):
+    POLL_INTERVAL.set(seconds)
+    job = scheduler.get_job(POLL_JOB_ID)
+    if job is not None and job.trigger.interval.total_seconds() != seconds:
+        scheduler.reschedule_job(POLL_JOB_ID, trigger="interval", seconds=seconds)
 
-# Create a scheduler to check for videos periodically
+def scheduled_poll():
+    """Scheduler job: poll, then tighten the interval if uploads were handled or back off if idle."""
+    reschedule_poll(poll_interval.record(check_and_download_videos() > 0))
+
+# Create a scheduler to check for videos periodically; the interval adapts to upload activity
 scheduler = BackgroundScheduler()
-scheduler.add_job(func=check_and_download_videos, trigger="interval", seconds=10)
+scheduler.add_job(func=scheduled_poll, trigger="interval", seconds=poll_interval.seconds, id=POLL_JOB_ID)
 scheduler.start()
+POLL_INTERVAL.set(poll_interval.seconds)
+
+# Import torch/OpenCV, load the model and phrase catalog and run dummy forwards off the request path
+start_background_warmup(MODEL_PATH, LABEL_ENCODER_PATH, DATASET_PATH, WARMUP_BATCH_SIZES, SERVER_IMPORT_STARTED,
+                        WARMUP_FRAME_COUNTS)
+
+@app.before_request
+def start_request_metrics():
+    """Assign a trace ID and start timing the request."""
+    # Clients may pass their own X-Trace-ID to correlate app and server logs
+    g.trace_id = request.headers.get("X-Trace-ID") or uuid.uuid4().hex
+    g.request_start = time.perf_counter()
+    IN_FLIGHT.inc(kind="http")
+
+@app.after_request
+def finish_request_metrics(response):
+    response.headers["X-Trace-ID"] = g.get("trace_id", "")
+    g.status_code = response.status_code
+    return response
+
+@app.teardown_request
+def record_request_metrics(error=None):
+    if "request_start" not in g:
+        return
+    IN_FLIGHT.dec(kind="http")
+    endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+    status_code = 500 if error else g.get("status_code", 200)
+    HTTP_SECONDS.observe(time.perf_counter() - g.request_start, endpoint=endpoint, status=status_code)
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus scrape endpoint for pipeline and HTTP metrics."""
+    return Response(render_prometheus(), mimetype="text/plain; version=0.0.4")
 
 @app.route('/status', methods=['GET'])
 def status():
@@ -101,9 +232,17 @@ def status():
     return jsonify({
         "status": "running",
         "temp_videos_directory": TEMP_VIDEOS_DIR,
-        "videos_count": len([f for f in os.listdir(TEMP_VIDEOS_DIR) if os.path.isfile(os.path.join(TEMP_VIDEOS_DIR, f))])
+        "videos_count": spool.count(),
+        "spool": spool.stats(),
+        "poll": {"interval_seconds": poll_interval.seconds, "watermark": upload_watermark.state()}
     })
 
+@app.route('/ready', methods=['GET'])
+def ready():
+    """Readiness probe: 200 once the model, phrase catalog and inference path are warm, 503 before."""
+    report = readiness()
+    return jsonify(report), (200 if report["ready"] else 503)
+
 @app.route('/latest-translation', methods=['GET'])
 def get_latest_translation():
     """Endpoint to get the latest sign language translation."""
@@ -121,16 +260,29 @@ def get_latest_translation():
         "timestamp": time.time()
     })
 
+@app.route('/translation/<path:public_id>', methods=['GET'])
+def get_translation(public_id):
+    """Endpoint to get the translation of one upload by its Cloudinary public_id; 404 until it is processed."""
+    with recent_translations_lock:
+        entry = recent_translations.get(public_id)
+    if entry is None:
+        return jsonify({"status": "pending", "video_id": public_id}), 404
+    return jsonify({"status": "done", "video_id": public_id, **entry})
+
 @app.route('/trigger-check', methods=['POST'])
 def trigger_check():
     """Manually trigger the check for new videos."""
-    check_and_download_videos()
+    # Don't hold the request behind a running poll; the interval reset brings the next one forward
+    handled = check_and_download_videos(wait=False)
+    reschedule_poll(poll_interval.reset())
+    if handled is None:
+        return jsonify({"status": "busy", "message": "Poll already running"}), 202
     return jsonify({"status": "success", "message": "Triggered check for new videos"})
 
 @app.route('/videos', methods=['GET'])
 def list_videos():
     """List all videos in the temp_videos directory."""
-    videos = [f for f in os.listdir(TEMP_VIDEOS_DIR) if os.path.isfile(os.path.join(TEMP_VIDEOS_DIR, f))]
+    videos = spool.names()
     return jsonify({
         "count": len(videos),
         "videos": videos
@@ -143,8 +295,12 @@ def cloudinary_webhook():
     try:
         data = request.json
         print(f"Received webhook from Cloudinary: {data}")
-        # You could trigger an immediate check here
-        check_and_download_videos()
+        # Check now and poll tightly for a while, more uploads usually follow.
+        # A poll already running is not waited for; the interval reset brings the next one forward.
+        handled = check_and_download_videos(wait=False)
+        reschedule_poll(poll_interval.reset())
+        if handled is None:
+            return jsonify({"status": "busy", "message": "Poll already running"}), 202
         return jsonify({"status": "success"})
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 400
@@ -169,8 +325,7 @@ def text_to_sign():
         output_path = os.path.join(TEMP_UPLOADS_DIR, f"text_to_sign_{timestamp}.mp4")
         
         # Generate the sign language video
-        dataset_path = "Python_AI/Example_videos"
-        generate_sentence_video(text, dataset_path, output_path)
+        text_pipeline().generate_sentence_video(text, DATASET_PATH, output_path)
         
         if not os.path.exists(output_path):
             return jsonify({
@@ -184,12 +339,13 @@ def text_to_sign():
         # Upload to Cloudinary in the text-to-sign folder
         # Using a folder keeps these videos separate from the sign-to-text videos
         # and prevents them from being automatically downloaded and processed
-        upload_result = cloudinary.uploader.upload(
-            output_path,
-            resource_type="video",
-            folder=folder_name,
-            public_id=f"text_to_sign_{timestamp}"
-        )
+        with stage_timer("upload"):
+            upload_result = cloudinary.uploader.upload(
+                output_path,
+                resource_type="video",
+                folder=folder_name,
+                public_id=f"text_to_sign_{timestamp}"
+            )
         
         # Print Cloudinary upload details for debugging
         print(f"Cloudinary upload successful. Public ID: {upload_result['public_id']}")
@@ -260,5 +416,5 @@ if __name__ == '__main__':
     check_and_download_videos()
         
     print(f"Starting Flask server. Videos will be saved to {TEMP_VIDEOS_DIR}")
-    print("Checking for new videos in the sign-to-text folder every 10 seconds...")
+    print(f"Checking for new videos in the sign-to-text folder every {poll_interval.min_seconds:g}-{poll_interval.max_seconds:g} seconds...")
     app.run(host='0.0.0.0', port=5000, debug=True) 
\ No newline at end of file
@@ -1,20 +1,78 @@
 import torch
-import joblib
 import os
-from torchvision.models.video import r3d_18, R3D_18_Weights
-from torchvision import transforms
+import sys
 from decord import VideoReader, cpu
-import numpy as np
+import threading
 
-def video_to_text(video_path, model_path="sign_language_model.pth", label_encoder_path="label_encoder.pkl", max_frames=16):
+# Model, preprocessing and frame sampling code is shared with the scripts in Python_AI/pyt.
+# Appended, so this directory's own modules (e.g. text_to_sign) still take precedence.
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Python_AI", "pyt"))
+
+from sign_models import load_sign_model_and_classes
+from preprocess import ClipBuffer
+from sampling import sample_frames
+from metrics import stage_timer, record_cache
+
+# Loaded (model, label classes) pairs keyed by (model_path, label_encoder_path, device)
+_model_cache = {}
+_model_cache_lock = threading.Lock()
+
+# Per-thread input buffers, so concurrent requests never share one
+_thread_buffers = threading.local()
+
+def get_clip_buffer(max_frames):
+    """Return this thread's reusable (1, C, T, 112, 112) input buffer."""
+    buffers = getattr(_thread_buffers, "buffers", None)
+    if buffers is None:
+        buffers = _thread_buffers.buffers = {}
+    if max_frames not in buffers:
+        buffers[max_frames] = ClipBuffer(batch_size=1, max_frames=max_frames)
+    return buffers[max_frames]
+
+def get_device():
+    return torch.device("cuda" if torch.cuda.is_available() else "cpu")
+
+def get_model(model_path, label_encoder_path, device):
+    """Return the cached (model, label classes) pair, loading it on first use."""
+    key = (os.path.abspath(model_path), os.path.abspath(label_encoder_path), device.type)
+    with _model_cache_lock:
+        cached = _model_cache.get(key)
+        record_cache("model", cached is not None)
+        if cached is not None:
+            return cached
+
+        with stage_timer("model_load"):
+            # Maps <model>.safetensors when present, so workers share one copy of the weights
+            model, classes = load_sign_model_and_classes(model_path, label_encoder_path, device)
+            if device.type == 'cuda':
+                model = model.half()
+        _model_cache[key] = (model, classes)
+        return model, classes
+
+def warmup_model(model_path, label_encoder_path, batch_sizes=(1,), frame_counts=(16,)):
+    """Run a dummy forward pass at each batch size and clip length so kernels are initialised before real traffic."""
+    device = get_device()
+    model, _ = get_model(model_path, label_encoder_path, device)
+    dtype = torch.float16 if device.type == 'cuda' else torch.float32
+    with torch.no_grad():
+        for frames in frame_counts:
+            for batch_size in batch_sizes:
+                with stage_timer("warmup_forward"):
+                    model(torch.zeros(batch_size, 3, frames, 112, 112, device=device, dtype=dtype))
+
+def video_to_text(video_path, model_path="sign_language_model.pth", label_encoder_path="label_encoder.pkl", max_frames=16, sampler="uniform", min_frames=None):
     """
     Convert a sign language video to text by predicting the sign.
     
     Args:
         video_path (str): Path to the video file.
-        model_path (str): Path to the trained model.
-        label_encoder_path (str): Path to the label encoder.
+        model_path (str): Path to the trained model (teacher state dict, distilled student checkpoint
+            or .safetensors); a .safetensors file next to a .pth is used in its place.
+        label_encoder_path (str): Path to the label encoder, only read for .pth checkpoints.
         max_frames (int): Maximum number of frames to use for prediction.
+        sampler (str): "uniform" spreads frames evenly; "adaptive" trims idle lead-in/out
+            and follows the motion.
+        min_frames (int): With "adaptive", frames used for mostly-still clips (default: always max_frames).
         
     Returns:
         str: The predicted sign language text.
@@ -30,52 +88,35 @@ def video_to_text(video_path, model_path="sign_language_model.pth", label_encode
             return "ERROR: Video file not found"
         
         # Set device
-        device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        
-        # Fast transform (batch-friendly)
-        transform = transforms.Compose([
-            transforms.Resize((112, 112)),
-        ])
+        device = get_device()
         
-        # Load label encoder
-        le = joblib.load(label_encoder_path)
-    
-        # Load model
-        weights = R3D_18_Weights.DEFAULT
-        model = r3d_18(weights=weights)
-        model.fc = torch.nn.Linear(model.fc.in_features, len(le.classes_))
-        model.load_state_dict(torch.load(model_path, map_location=device))
-        model = model.to(device).eval()
-    
-        if device.type == 'cuda':
-            model = model.half()
+        # Load label encoder and model (cached after the first call)
+        model, classes = get_model(model_path, label_encoder_path, device)
         
         # Load and preprocess video
-        vr = VideoReader(abs_video_path, ctx=cpu(0))
-        total_frames = len(vr)
-    
-        if total_frames < max_frames:
-            indices = np.linspace(0, total_frames - 1, max_frames).astype(int)
-        else:
-            indices = np.linspace(0, total_frames - 1, max_frames).astype(int)
-    
-        frames = vr.get_batch(indices).asnumpy()  # (T, H, W, C)
-        frames = torch.from_numpy(frames).permute(3, 0, 1, 2).float() / 255.0  # (C, T, H, W)
-        frames = transform(frames)
-        video = frames.unsqueeze(0)  # (1, C, T, H, W)
-        
-        video = video.to(device)
-        if device.type == 'cuda':
-            video = video.half()
+        with stage_timer("decode"):
+            vr = VideoReader(abs_video_path, ctx=cpu(0))
+            indices, frames, order = sample_frames(vr, max_frames, sampler, min_frames)  # frames: (N, H, W, C)
+
+        with stage_timer("preprocess"):
+            # Resize in uint8, then scale into the thread's reused float buffer
+            buffer = get_clip_buffer(len(indices))
+            buffer.fill(0, frames, order)
+            video = buffer.batch(1)  # (1, C, T, H, W)
+            
+            video = video.to(device)
+            if device.type == 'cuda':
+                video = video.half()
     
         # Predict
-        with torch.no_grad():
+        with stage_timer("forward"), torch.no_grad():
             outputs = model(video)
             probabilities = torch.nn.functional.softmax(outputs, dim=1)[0]
             top_probs, top_indices = torch.topk(probabilities, 1)
     
         # Return the predicted text
-        result = le.inverse_transform([top_indices[0].item()])[0]
+        with stage_timer("label_decode"):
+            result = classes[top_indices[0].item()]
         print(f"Successfully predicted: {result}")
         return result
     
@@ -0,0 +1,168 @@
+import atexit
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+PENDING = "pending"
+PROCESSED = "processed"
+FAILED = "failed"
+STATES = (PENDING, PROCESSED, FAILED)
+
+INDEX_FILENAME = ".spool_index.json"
+
+class VideoSpool:
+    """
+    Bounded spool directory for downloaded clips with an in-memory index.
+
+    Every file is tracked with its size and state (pending, processed or
+    failed), so counts and listings never touch the filesystem. Processed
+    files are evicted oldest-first once the spool exceeds `max_bytes`, and
+    processed or failed files are evicted once older than `max_age_seconds`.
+    The index is persisted next to the clips and reloaded on restart. Changes
+    within `persist_delay` seconds share one index write; a write lost to a
+    crash only costs the states of those files, which recovery treats as failed.
+    """
+
+    def __init__(self, directory, max_bytes=1024 ** 3, max_age_seconds=24 * 3600, persist_delay=1.0):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.persist_delay = persist_delay
+        self._index_path = os.path.join(directory, INDEX_FILENAME)
+        self._entries = OrderedDict()  # name -> {"size", "state", "updated"}, oldest update first
+        self._counts = {state: 0 for state in STATES}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._persist_timer = None
+        os.makedirs(directory, exist_ok=True)
+        self._recover()
+        atexit.register(self.flush)
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def add(self, name):
+        """Register a file that has just been written into the spool as pending."""
+        size = os.path.getsize(self.path(name))
+        with self._lock:
+            self._remove_entry(name)
+            self._insert_entry(name, {"size": size, "state": PENDING, "updated": time.time()})
+            self._evict()
+            self._persist()
+
+    def mark(self, name, state):
+        """Move a file to a new state (processed or failed) and apply the eviction budget."""
+        if state not in STATES:
+            raise ValueError(f"Unknown spool state: {state}")
+        with self._lock:
+            entry = self._remove_entry(name)
+            if entry is None:
+                return
+            entry.update({"state": state, "updated": time.time()})
+            self._insert_entry(name, entry)
+            self._evict()
+            self._persist()
+
+    def flush(self):
+        """Write the index now if it changed since the last write."""
+        with self._lock:
+            self._persist_timer = None
+            if self._dirty:
+                self._write_index()
+
+    def count(self, state=None):
+        with self._lock:
+            return len(self._entries) if state is None else self._counts[state]
+
+    def names(self):
+        with self._lock:
+            return list(self._entries)
+
+    def stats(self):
+        with self._lock:
+            return {"files": len(self._entries), "bytes": self._total_bytes,
+                    "max_bytes": self.max_bytes, "max_age_seconds": self.max_age_seconds,
+                    **self._counts}
+
+    def _insert_entry(self, name, entry):
+        self._entries[name] = entry
+        self._counts[entry["state"]] += 1
+        self._total_bytes += entry["size"]
+
+    def _remove_entry(self, name):
+        entry = self._entries.pop(name, None)
+        if entry is not None:
+            self._counts[entry["state"]] -= 1
+            self._total_bytes -= entry["size"]
+        return entry
+
+    def _evict(self):
+        cutoff = time.time() - self.max_age_seconds
+        # _entries is ordered by last update, so the oldest candidates come first
+        for name, entry in list(self._entries.items()):
+            if entry["updated"] >= cutoff and self._total_bytes <= self.max_bytes:
+                break  # Everything after this is newer and the size budget is met
+            expired = entry["updated"] < cutoff and entry["state"] != PENDING
+            over_budget = self._total_bytes > self.max_bytes and entry["state"] == PROCESSED
+            if not (expired or over_budget):
+                continue
+            self._remove_entry(name)
+            try:
+                os.remove(self.path(name))
+            except FileNotFoundError:
+                pass
+            print(f"Evicted {name} from spool ({entry['state']}, {entry['size']} bytes)")
+
+    def _persist(self):
+        """Schedule an index write `persist_delay` seconds out, unless one is already scheduled."""
+        self._dirty = True
+        if self.persist_delay <= 0:
+            self._write_index()
+        elif self._persist_timer is None:
+            self._persist_timer = threading.Timer(self.persist_delay, self.flush)
+            self._persist_timer.daemon = True
+            self._persist_timer.start()
+
+    def _write_index(self):
+        tmp_path = self._index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._entries, f)
+        os.replace(tmp_path, self._index_path)
+        self._dirty = False
+
+    def _recover(self):
+        """Rebuild the index from the saved copy, reconciled with what is actually on disk."""
+        saved = {}
+        if os.path.exists(self._index_path):
+            try:
+                with open(self._index_path) as f:
+                    saved = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Spool index unreadable, rebuilding from directory: {str(e)}")
+
+        on_disk = {}
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.is_file() and not entry.name.startswith(INDEX_FILENAME):
+                    stat = entry.stat()
+                    on_disk[entry.name] = (stat.st_size, stat.st_mtime)
+
+        recovered = []
+        for name, (size, mtime) in on_disk.items():
+            entry = saved.get(name)
+            if entry is None or entry.get("state") not in STATES:
+                entry = {"state": PENDING, "updated": mtime}
+            # Work that was pending when the previous run stopped never produced a result
+            if entry["state"] == PENDING:
+                entry["state"] = FAILED
+            recovered.append((name, {"size": size, "state": entry["state"], "updated": entry["updated"]}))
+
+        with self._lock:
+            for name, entry in sorted(recovered, key=lambda item: item[1]["updated"]):
+                self._insert_entry(name, entry)
+            self._evict()
+            self._write_index()
+        print(f"Spool recovered {len(self._entries)} files ({self._total_bytes} bytes) from {self.directory}")
@@ -2,7 +2,13 @@ import os
 import cv2
 import re
 import string
+import threading
 from glob import glob
+from metrics import stage_timer, record_cache
+
+# Label maps keyed by dataset path, invalidated when the directory's mtime changes
+_label_map_cache = {}
+_label_map_cache_lock = threading.Lock()
 
 def clean_text(text):
     """Lowercase, remove digits, punctuation and extension."""
@@ -21,6 +27,18 @@ def extract_label_map(dataset_path):
             label_map[cleaned_label] = file_path
     return label_map
 
+def get_label_map(dataset_path):
+    """Return the cached label map for dataset_path, rebuilding it if clips were added or removed."""
+    mtime = os.path.getmtime(dataset_path) if os.path.isdir(dataset_path) else None
+    with _label_map_cache_lock:
+        cached = _label_map_cache.get(dataset_path)
+        hit = cached is not None and cached[0] == mtime
+        record_cache("label_map", hit)
+        if not hit:
+            cached = (mtime, extract_label_map(dataset_path))
+            _label_map_cache[dataset_path] = cached
+        return cached[1]
+
 def match_best_phrases(sentence, label_map):
     """Dynamic programming to find the best matching sequence of phrases."""
     sentence = sentence.lower().translate(str.maketrans('', '', string.punctuation))
@@ -82,16 +100,18 @@ def merge_videos_opencv(video_paths, output_path):
 
 def generate_sentence_video(sentence, dataset_path, output_path):
     """Main function to generate the final video."""
-    label_map = extract_label_map(dataset_path)
+    label_map = get_label_map(dataset_path)
     print(f"🎯 Labels available: {list(label_map.keys())}\n")
 
-    matched = match_best_phrases(sentence, label_map)
+    with stage_timer("phrase_match"):
+        matched = match_best_phrases(sentence, label_map)
     print("🔍 Best matched phrases:")
     for phrase, path in matched:
         print(f"  ✅ '{phrase}' → {path}")
 
     video_paths = [path for _, path in matched]
-    merge_videos_opencv(video_paths, output_path)
+    with stage_timer("video_merge"):
+        merge_videos_opencv(video_paths, output_path)
 
 # Example usage
 if __name__ == "__main__":
@@ -0,0 +1,80 @@
+import importlib
+import threading
+import time
+from metrics import STARTUP_SECONDS
+
+COMPONENTS = ("pipeline_imports", "model_registry", "phrase_catalog", "inference_workers")
+
+_state = {name: {"ready": False, "seconds": None, "error": None} for name in COMPONENTS}
+_state_lock = threading.Lock()
+_import_to_ready = None
+
+def sign_pipeline():
+    """Import sign_to_text (torch, torchvision, decord) on first use."""
+    return importlib.import_module("sign_to_text")
+
+def text_pipeline():
+    """Import text_to_sign (OpenCV) on first use."""
+    return importlib.import_module("text_to_sign")
+
+def _run_component(name, fn):
+    start = time.perf_counter()
+    try:
+        fn()
+    except Exception as e:
+        with _state_lock:
+            _state[name]["error"] = str(e)
+        print(f"Warmup of {name} failed: {str(e)}")
+        return False
+    elapsed = time.perf_counter() - start
+    with _state_lock:
+        _state[name].update({"ready": True, "seconds": elapsed, "error": None})
+    STARTUP_SECONDS.set(elapsed, phase=name)
+    print(f"Warmup: {name} ready in {elapsed:.2f}s")
+    return True
+
+def run_warmup(model_path, label_encoder_path, dataset_path, batch_sizes, started_at, frame_counts=(16,)):
+    """
+    Warm every component the request paths need, in dependency order.
+
+    `started_at` is the perf_counter() value taken when the server module
+    started importing, so the reported time covers the whole cold start.
+    """
+    global _import_to_ready
+
+    if not _run_component("pipeline_imports", lambda: (sign_pipeline(), text_pipeline())):
+        return
+    model_ready = _run_component("model_registry",
+                                 lambda: sign_pipeline().get_model(model_path, label_encoder_path, sign_pipeline().get_device()))
+    _run_component("phrase_catalog", lambda: text_pipeline().get_label_map(dataset_path))
+    if model_ready:
+        _run_component("inference_workers",
+                       lambda: sign_pipeline().warmup_model(model_path, label_encoder_path, batch_sizes, frame_counts))
+
+    if is_ready():
+        _import_to_ready = time.perf_counter() - started_at
+        STARTUP_SECONDS.set(_import_to_ready, phase="import_to_ready")
+        print(f"Server ready {_import_to_ready:.2f}s after import")
+
+def start_background_warmup(model_path, label_encoder_path, dataset_path, batch_sizes, started_at, frame_counts=(16,)):
+    thread = threading.Thread(
+        target=run_warmup,
+        args=(model_path, label_encoder_path, dataset_path, batch_sizes, started_at, frame_counts),
+        name="warmup",
+        daemon=True,
+    )
+    thread.start()
+    return thread
+
+def is_ready():
+    with _state_lock:
+        return all(component["ready"] for component in _state.values())
+
+def readiness():
+    with _state_lock:
+        components = {name: dict(component) for name, component in _state.items()}
+    return {
+        "ready": all(component["ready"] for component in components.values()),
+        "components": components,
+        "import_to_ready_seconds": _import_to_ready,
+    }
@@ -0,0 +1,218 @@
+import os
+import sys
+import json
+import time
+import argparse
+import numpy as np
+import torch
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from sign_models import load_sign_model_and_classes
+from preprocess import ClipBuffer
+
+VIDEO_EXTENSIONS = (".mov", ".mp4", ".avi", ".mkv")
+
+# Per-process decode state, created once by _init_worker
+_worker_buffer = None
+
+def _init_worker(max_frames):
+    global _worker_buffer
+    torch.set_num_threads(1)  # Decoding parallelism comes from the pool, not intra-op threads
+    _worker_buffer = ClipBuffer(batch_size=1, max_frames=max_frames)
+
+def decode_clip(path):
+    """Decode uniformly sampled frames and resize them to (T, 112, 112, C) uint8 in a worker process."""
+    from decord import VideoReader, cpu
+    vr = VideoReader(path, ctx=cpu(0))
+    indices = np.linspace(0, len(vr) - 1, _worker_buffer.max_frames).astype(int)
+    return _worker_buffer.resize(vr.get_batch(indices).asnumpy())
+
+def read_sources(source):
+    """List clips from a directory (recursively) or a manifest (.txt: one path per line, .jsonl: {"path": ...})."""
+    if os.path.isdir(source):
+        paths = []
+        for root, _, files in os.walk(source):
+            paths.extend(os.path.join(root, f) for f in files if f.lower().endswith(VIDEO_EXTENSIONS))
+        return sorted(paths)
+
+    base = os.path.dirname(os.path.abspath(source))
+    paths = []
+    with open(source) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            path = json.loads(line)["path"] if source.endswith(".jsonl") else line
+            paths.append(path if os.path.isabs(path) else os.path.join(base, path))
+    return paths
+
+class JsonlWriter:
+    def __init__(self, path):
+        self.file = open(path, "a")
+
+    def write(self, rows):
+        for row in rows:
+            self.file.write(json.dumps(row) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        self.file.close()
+
+class ParquetWriter:
+    """Writes each flushed batch as a new part file, so a resumed run never rewrites earlier output."""
+
+    def __init__(self, directory):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            sys.exit("Parquet output needs pyarrow: pip install pyarrow")
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.part = len([f for f in os.listdir(directory) if f.endswith(".parquet")])
+
+    def write(self, rows):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        pq.write_table(pa.Table.from_pylist(rows), os.path.join(self.directory, f"part-{self.part:05d}.parquet"))
+        self.part += 1
+
+    def close(self):
+        pass
+
+class Checkpoint:
+    """Append-only manifest of clips whose predictions are already written."""
+
+    def __init__(self, path):
+        self.path = path
+        self.done = set()
+        if os.path.exists(path):
+            with open(path) as f:
+                self.done = {line.rstrip("\n") for line in f if line.strip()}
+        self.file = open(path, "a")
+
+    def record(self, paths):
+        self.file.write("".join(p + "\n" for p in paths))
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.done.update(paths)
+
+    def close(self):
+        self.file.close()
+
+def predict_batch(model, buffer, clips, classes, device, top_k):
+    """Run one forward pass over the filled buffer slots and return top-k labels/probabilities per clip."""
+    for slot, frames in enumerate(clips):
+        buffer.fill(slot, frames)
+    video = buffer.batch(len(clips)).to(device)
+    if device.type == 'cuda':
+        video = video.half()
+    with torch.no_grad():
+        probabilities = torch.nn.functional.softmax(model(video).float(), dim=1)
+        top_probs, top_indices = torch.topk(probabilities, top_k, dim=1)
+    return [
+        ([str(classes[i]) for i in indices], [round(p, 6) for p in probs])
+        for indices, probs in zip(top_indices.tolist(), top_probs.tolist())
+    ]
+
+def batch_translate(source, output, model_path="sign_language_model.pth", label_encoder_path="label_encoder.pkl",
+                    arch="r3d_18", batch_size=8, workers=None, top_k=3, max_frames=16, output_format=None,
+                    checkpoint_path=None, progress_every=10.0):
+    """
+    Recognise every clip under `source`, writing top-k results to `output` as it goes.
+
+    Clips already listed in the checkpoint manifest (default `<output>.checkpoint`)
+    are skipped, so an interrupted run resumes where it stopped. Clips that
+    failed to decode get an error row but are not checkpointed, so a rerun
+    retries them. A retry or a crash between writing a batch and checkpointing
+    it can repeat rows, so consumers should key results by "path" and take
+    the last one.
+    """
+    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    output_format = output_format or ("parquet" if output.endswith(".parquet") else "jsonl")
+    checkpoint = Checkpoint(checkpoint_path or output.rstrip("/\\") + ".checkpoint")
+
+    paths = read_sources(source)
+    pending = [p for p in paths if p not in checkpoint.done]
+    print(f"📂 {len(paths)} clips found, {len(paths) - len(pending)} already done, {len(pending)} to translate")
+    if not pending:
+        checkpoint.close()
+        return
+
+    model, classes = load_sign_model_and_classes(model_path, label_encoder_path, device, arch=arch)
+    if device.type == 'cuda':
+        model = model.half()
+    buffer = ClipBuffer(batch_size=batch_size, max_frames=max_frames)
+    top_k = min(top_k, len(classes))
+
+    writer = ParquetWriter(output) if output_format == "parquet" else JsonlWriter(output)
+    start_time, last_report, processed = time.time(), 0.0, 0
+    ready, rows = [], []  # decoded (path, frames) awaiting inference; finished rows awaiting flush
+
+    def flush():
+        nonlocal processed, last_report
+        if ready:
+            for (path, _), (labels, probs) in zip(ready, predict_batch(model, buffer, [f for _, f in ready], classes, device, top_k)):
+                rows.append({"path": path, "top1": labels[0], "labels": labels, "probabilities": probs, "error": None})
+            ready.clear()
+        if not rows:
+            return
+        writer.write(rows)
+        # Failed decodes are written for visibility but not checkpointed, so a resumed run retries them
+        checkpoint.record([row["path"] for row in rows if row["error"] is None])
+        processed += len(rows)
+        rows.clear()
+
+        now = time.time()
+        if now - last_report >= progress_every or processed == len(pending):
+            last_report = now
+            rate = processed / (now - start_time)
+            eta = (len(pending) - processed) / rate if rate else float("inf")
+            print(f"{processed}/{len(pending)} clips | {rate:.1f} clips/s | ETA {eta / 60:.1f} min")
+
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(max_frames,)) as pool:
+        # Keep a bounded window of decodes in flight so memory stays flat on huge archives
+        queue = iter(pending)
+        in_flight = {}
+        for path in queue:
+            in_flight[pool.submit(decode_clip, path)] = path
+            if len(in_flight) >= workers * 4:
+                break
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = in_flight.pop(future)
+                try:
+                    ready.append((path, future.result()))
+                except Exception as e:
+                    rows.append({"path": path, "top1": None, "labels": [], "probabilities": [], "error": str(e)})
+                next_path = next(queue, None)
+                if next_path is not None:
+                    in_flight[pool.submit(decode_clip, next_path)] = next_path
+                if len(ready) >= batch_size:
+                    flush()
+        flush()
+
+    writer.close()
+    checkpoint.close()
+    elapsed = time.time() - start_time
+    print(f"✅ Translated {processed} clips in {elapsed:.1f}s ({processed / elapsed:.1f} clips/s) → {output}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Translate a directory or manifest of sign clips in bulk.")
+    parser.add_argument("source", help="Directory to scan recursively, or a .txt/.jsonl manifest of clip paths")
+    parser.add_argument("output", help="Results file (.jsonl) or directory of part files (.parquet)")
+    parser.add_argument("--model", default="sign_language_model.pth")
+    parser.add_argument("--label-encoder", default="label_encoder.pkl", help="Not needed when a .safetensors checkpoint is used")
+    parser.add_argument("--arch", default="r3d_18", help="Architecture for plain state dicts (r3d_18, mc3_18)")
+    parser.add_argument("--format", choices=["jsonl", "parquet"], help="Default: from the output extension")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=None, help="Decode processes (default: CPU count)")
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--max-frames", type=int, default=16)
+    parser.add_argument("--checkpoint", help="Resume manifest (default: <output>.checkpoint)")
+    args = parser.parse_args()
+
+    batch_translate(args.source, args.output, args.model, args.label_encoder, args.arch, args.batch_size,
+                    args.workers, args.top_k, args.max_frames, args.format, args.checkpoint)
@@ -0,0 +1,150 @@
+import os
+import json
+import time
+import argparse
+import cv2
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+TRIM_INDEX_FILENAME = "trim_index.json"
+VIDEO_EXTENSIONS = (".mov", ".mp4")
+# Version 1 entries carried hand tracking over from the previous clip a worker indexed
+INDEX_VERSION = 2
+
+def detect_active_span(video_path, pad_frames=2, min_detection_confidence=0.5, min_tracking_confidence=0.5):
+    """Run hand detection over every frame and return the clip's active [start, end] frame range."""
+    import mediapipe as mp
+
+    cap = cv2.VideoCapture(video_path)
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+
+    first, last, frame_count = None, None, 0
+    # A fresh detector per clip: in tracking mode Hands seeds each frame from the previous
+    # one, so a shared detector would start this clip from the last clip's hands
+    with mp.solutions.hands.Hands(min_detection_confidence=min_detection_confidence,
+                                  min_tracking_confidence=min_tracking_confidence) as hands:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            results = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            if results.multi_hand_landmarks:
+                if first is None:
+                    first = frame_count
+                last = frame_count
+            frame_count += 1
+    cap.release()
+
+    hands_found = first is not None
+    if not hands_found:
+        # Nothing detected: keep the whole clip rather than dropping the sign
+        first, last = 0, max(0, frame_count - 1)
+    return {
+        "fps": fps,
+        "width": width,
+        "height": height,
+        "frame_count": frame_count,
+        "start": max(0, first - pad_frames),
+        "end": min(max(0, frame_count - 1), last + pad_frames),
+        "hands_found": hands_found,
+    }
+
+def _index_one(video_path, pad_frames, min_detection_confidence, min_tracking_confidence):
+    stat = os.stat(video_path)
+    entry = detect_active_span(video_path, pad_frames, min_detection_confidence, min_tracking_confidence)
+    entry.update({"size": stat.st_size, "mtime": stat.st_mtime})
+    return entry
+
+def entry_is_current(entry, video_path):
+    """True if the clip on disk still has the size and mtime it was indexed with."""
+    stat = os.stat(video_path)
+    return entry.get("size") == stat.st_size and entry.get("mtime") == stat.st_mtime
+
+def scan_library(library_root):
+    """Map index keys (paths relative to the library, '/'-separated) to absolute clip paths."""
+    clips = {}
+    for root, _, files in os.walk(library_root):
+        for filename in files:
+            if filename.lower().endswith(VIDEO_EXTENSIONS):
+                path = os.path.join(root, filename)
+                clips[os.path.relpath(path, library_root).replace(os.sep, "/")] = path
+    return clips
+
+def load_trim_index(library_root, index_path=None):
+    """Load the trim index as {absolute clip path: entry}; empty if it has not been built yet."""
+    index_path = index_path or os.path.join(library_root, TRIM_INDEX_FILENAME)
+    if not os.path.exists(index_path):
+        return {}
+    with open(index_path) as f:
+        index = json.load(f)
+    return {os.path.normpath(os.path.join(library_root, key)): entry for key, entry in index.get("clips", {}).items()}
+
+def _save_index(index_path, clips):
+    tmp_path = index_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"version": INDEX_VERSION, "clips": clips}, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, index_path)
+
+def build_trim_index(library_root, index_path=None, workers=None, pad_frames=2,
+                     min_detection_confidence=0.5, min_tracking_confidence=0.5, save_every=20):
+    """
+    Index the active hand span of every clip in the library.
+
+    Only clips that are new or whose size/mtime changed are re-detected;
+    entries for deleted clips are dropped. Progress is saved every
+    `save_every` clips so an interrupted run resumes where it stopped.
+    """
+    index_path = index_path or os.path.join(library_root, TRIM_INDEX_FILENAME)
+    clips = {}
+    if os.path.exists(index_path):
+        with open(index_path) as f:
+            saved = json.load(f)
+        if saved.get("version") == INDEX_VERSION:
+            clips = saved.get("clips", {})
+
+    on_disk = scan_library(library_root)
+    removed = [key for key in clips if key not in on_disk]
+    for key in removed:
+        del clips[key]
+
+    stale = []
+    for key, path in on_disk.items():
+        entry = clips.get(key)
+        if entry is None or not entry_is_current(entry, path):
+            stale.append(key)
+
+    print(f"📚 {len(on_disk)} clips in library: {len(stale)} to index, {len(removed)} removed")
+    if not stale:
+        if removed:
+            _save_index(index_path, clips)
+        return clips
+
+    start_time = time.time()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_index_one, on_disk[key], pad_frames, min_detection_confidence,
+                               min_tracking_confidence): key for key in stale}
+        for done, future in enumerate(as_completed(futures), 1):
+            key = futures[future]
+            try:
+                clips[key] = future.result()
+            except Exception as e:
+                print(f"⚠️ Failed to index {key}: {str(e)}")
+                continue
+            if done % save_every == 0:
+                _save_index(index_path, clips)
+                print(f"Indexed {done}/{len(stale)} clips ({done / (time.time() - start_time):.1f} clips/s)")
+
+    _save_index(index_path, clips)
+    print(f"✅ Trim index saved to {index_path} ({time.time() - start_time:.1f}s)")
+    return clips
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or update the hand-activity trim index for a sign clip library.")
+    parser.add_argument("library", nargs="?", default=r"../Example_videos")
+    parser.add_argument("--index", help=f"Index path (default: <library>/{TRIM_INDEX_FILENAME})")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--pad-frames", type=int, default=2, help="Frames kept either side of the detected span")
+    args = parser.parse_args()
+
+    build_trim_index(args.library, args.index, args.workers, args.pad_frames)
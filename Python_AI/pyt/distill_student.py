@@ -0,0 +1,169 @@
+import json
+import time
+import joblib
+import numpy as np
+import torch
+import torch.nn.functional as F
+from torch.utils.data import DataLoader
+import torchvision.transforms as transforms
+from sklearn.model_selection import train_test_split
+
+from train_pytorch import SignLanguageVideoDataset, load_videos_and_labels, device
+from sign_models import SignStudent3D, load_sign_model, student_checkpoint, count_parameters
+from mmap_checkpoint import mmap_checkpoint_path, save_mmap_checkpoint
+
+def distillation_loss(student_logits, teacher_logits, targets, temperature=4.0, alpha=0.7):
+    """Blend KL divergence to the teacher's softened outputs with hard-label cross entropy."""
+    soft_loss = F.kl_div(
+        F.log_softmax(student_logits / temperature, dim=1),
+        F.softmax(teacher_logits / temperature, dim=1),
+        reduction="batchmean",
+    ) * (temperature ** 2)
+    hard_loss = F.cross_entropy(student_logits, targets)
+    return alpha * soft_loss + (1 - alpha) * hard_loss
+
+def evaluate(model, loader):
+    model.eval()
+    correct, total = 0, 0
+    with torch.no_grad():
+        for inputs, targets in loader:
+            inputs, targets = inputs.to(device), targets.to(device)
+            _, predicted = model(inputs).max(1)
+            correct += predicted.eq(targets).sum().item()
+            total += targets.size(0)
+    return correct / total if total else 0.0
+
+def cpu_latency_ms(model, max_frames=16, runs=20, warmup=3):
+    """Median single-clip forward latency on CPU, in milliseconds."""
+    model = model.to("cpu").float().eval()
+    video = torch.zeros(1, 3, max_frames, 112, 112)
+    timings = []
+    with torch.no_grad():
+        for _ in range(warmup):
+            model(video)
+        for _ in range(runs):
+            start = time.perf_counter()
+            model(video)
+            timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+def distill_model(dataset_path, teacher_path="sign_language_model.pth", label_encoder_path="label_encoder.pkl",
+                  batch_size=8, epochs=30, lr=1e-3, temperature=4.0, alpha=0.7,
+                  student_path="student_sign_model.pth", student_label_encoder_path="student_label_encoder.pkl",
+                  report_path="distillation_report.json"):
+    print("Starting student distillation...")
+
+    video_paths, raw_labels = load_videos_and_labels(dataset_path)
+
+    # Reuse the teacher's encoder so class indices line up with its logits
+    le = joblib.load(label_encoder_path)
+    labels_encoded = le.transform(raw_labels)
+
+    # Same split as train_pytorch.py, so validation clips were never seen by the teacher
+    train_videos, holdout_videos, train_labels, holdout_labels = train_test_split(
+        video_paths, labels_encoded, test_size=0.2, stratify=labels_encoded, random_state=42)
+
+    # Half the holdout picks the best student epoch, the other half is only used for the report,
+    # so the reported student accuracy is not the maximum over epochs
+    try:
+        val_videos, test_videos, val_labels, test_labels = train_test_split(
+            holdout_videos, holdout_labels, test_size=0.5, stratify=holdout_labels, random_state=42)
+    except ValueError:  # A class with a single holdout clip cannot be stratified
+        val_videos, test_videos, val_labels, test_labels = train_test_split(
+            holdout_videos, holdout_labels, test_size=0.5, random_state=42)
+
+    print(f"Train videos: {len(train_videos)}, Validation videos: {len(val_videos)}, Test videos: {len(test_videos)}")
+
+    transform = transforms.Compose([
+        transforms.Resize((112, 112))
+    ])
+
+    train_dataset = SignLanguageVideoDataset(train_videos, train_labels, transform)
+    val_dataset = SignLanguageVideoDataset(val_videos, val_labels, transform)
+    test_dataset = SignLanguageVideoDataset(test_videos, test_labels, transform)
+
+    train_loader = DataLoader(train_dataset, batch_size=batch_size, shuffle=True, num_workers=0)
+    val_loader = DataLoader(val_dataset, batch_size=batch_size, shuffle=False, num_workers=0)
+    test_loader = DataLoader(test_dataset, batch_size=batch_size, shuffle=False, num_workers=0)
+
+    teacher = load_sign_model(teacher_path, len(le.classes_), device)
+    for param in teacher.parameters():
+        param.requires_grad_(False)
+
+    student = SignStudent3D(len(le.classes_)).to(device)
+    print(f"Teacher parameters: {count_parameters(teacher):,}, Student parameters: {count_parameters(student):,}")
+
+    optimizer = torch.optim.AdamW(student.parameters(), lr=lr, weight_decay=1e-4)
+    scheduler = torch.optim.lr_scheduler.CosineAnnealingLR(optimizer, T_max=epochs)
+
+    best_acc, best_state = -1.0, None
+    for epoch in range(epochs):
+        print(f"Epoch {epoch + 1}/{epochs}")
+        student.train()
+        running_loss, correct, total = 0.0, 0, 0
+
+        for batch_idx, (inputs, targets) in enumerate(train_loader):
+            if batch_idx % 100 == 0:
+                print(f"Batch {batch_idx}/{len(train_loader)}")
+
+            inputs, targets = inputs.to(device), targets.to(device)
+            with torch.no_grad():
+                teacher_logits = teacher(inputs)
+
+            optimizer.zero_grad()
+            outputs = student(inputs)
+            loss = distillation_loss(outputs, teacher_logits, targets, temperature, alpha)
+            loss.backward()
+            optimizer.step()
+
+            running_loss += loss.item() * inputs.size(0)
+            _, predicted = outputs.max(1)
+            correct += predicted.eq(targets).sum().item()
+            total += targets.size(0)
+        scheduler.step()
+
+        print(f"Distill Loss: {running_loss/total:.4f}, Train Accuracy: {correct / total * 100:.2f}%")
+
+        val_acc = evaluate(student, val_loader)
+        print(f"Validation Accuracy: {val_acc * 100:.2f}%\n")
+        if val_acc > best_acc:
+            best_acc = val_acc
+            best_state = {k: v.detach().clone() for k, v in student.state_dict().items()}
+
+    student.load_state_dict(best_state)
+
+    # Self-describing checkpoint: sign_models.load_sign_model rebuilds the student from it
+    checkpoint = student_checkpoint(student)
+    torch.save(checkpoint, student_path)
+    joblib.dump(le, student_label_encoder_path)
+    save_mmap_checkpoint(mmap_checkpoint_path(student_path), checkpoint["state_dict"], le.classes_,
+                         arch=checkpoint["arch"], config=checkpoint["config"])
+    print(f"✅ Student saved to {student_path} (+ {mmap_checkpoint_path(student_path)}) with encoder {student_label_encoder_path}")
+
+    report = {}
+    for name, model in (("teacher", teacher), ("student", student)):
+        report[name] = {
+            "test_accuracy": evaluate(model, test_loader),
+            "parameters": count_parameters(model),
+            "cpu_latency_ms": cpu_latency_ms(model),
+        }
+        model.to(device)
+    report["student"]["best_val_accuracy"] = best_acc  # Used to pick the epoch, so biased upward
+    report["test_clips"] = len(test_videos)
+
+    print("\n📊 Distillation report")
+    print(f"{'model':<10}{'test acc':>10}{'params':>14}{'cpu ms':>10}")
+    for name in ("teacher", "student"):
+        row = report[name]
+        print(f"{name:<10}{row['test_accuracy'] * 100:>9.2f}%{row['parameters']:>14,}{row['cpu_latency_ms']:>10.1f}")
+    print(f"Test accuracy on {len(test_videos)} held-out clips not used for epoch selection")
+
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {report_path}")
+
+    return student, report
+
+if __name__ == "__main__":
+    dataset_path = r"E:\Ishan\K.K. Wagh\Sixth Semester\Mobile Application Development\dataset3"
+    student, report = distill_model(dataset_path, batch_size=8, epochs=30, lr=1e-3)
@@ -1,22 +1,28 @@
 import torch
 import joblib
 import numpy as np
-import cv2
 from decord import VideoReader, cpu
 from torchvision.models.video import mc3_18, MC3_18_Weights
 import torch.nn.functional as F
+from preprocess import ClipBuffer
 
 device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
+# Reused input buffers, keyed by (frame count, size)
+clip_buffers = {}
+
 def load_video_ultra_fast(video_path, max_frames=16, resize=(112, 112)):
     vr = VideoReader(video_path, ctx=cpu(0))
     total_frames = len(vr)
     indices = np.linspace(0, total_frames - 1, max_frames).astype(int)
     frames = vr.get_batch(indices).asnumpy()  # (T, H, W, C)
 
-    resized_frames = np.stack([cv2.resize(f, resize) for f in frames])  # (T, H, W, C)
-    video = torch.from_numpy(resized_frames).permute(3, 0, 1, 2).float() / 255.0  # (C, T, H, W)
-    return video.unsqueeze(0)  # (1, C, T, H, W)
+    key = (max_frames, resize)
+    if key not in clip_buffers:
+        clip_buffers[key] = ClipBuffer(batch_size=1, max_frames=max_frames, size=(resize[1], resize[0]))
+    buffer = clip_buffers[key]
+    buffer.fill(0, frames)  # one uint8 resize for the whole clip, no per-frame loop
+    return buffer.batch(1)  # (1, C, T, H, W)
 
 def predict_sign_video_ultrafast(video_path, model_path, label_encoder_path, max_frames=16):
     # Load label encoder
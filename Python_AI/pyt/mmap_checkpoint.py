@@ -0,0 +1,91 @@
+import os
+import json
+import numpy as np
+import torch
+
+MMAP_CHECKPOINT_EXTENSION = ".safetensors"
+
+# safetensors dtype codes (bfloat16 is left out: numpy has no dtype to map it through)
+_DTYPE_CODES = {
+    torch.float32: "F32",
+    torch.float16: "F16",
+    torch.float64: "F64",
+    torch.int64: "I64",
+    torch.int32: "I32",
+    torch.uint8: "U8",
+    torch.bool: "BOOL",
+}
+_NUMPY_DTYPES = {"F32": np.float32, "F16": np.float16, "F64": np.float64,
+                 "I64": np.int64, "I32": np.int32, "U8": np.uint8, "BOOL": np.bool_}
+
+def mmap_checkpoint_path(model_path):
+    """The .safetensors file written alongside a .pth checkpoint (or the path itself if it is one)."""
+    return os.path.splitext(model_path)[0] + MMAP_CHECKPOINT_EXTENSION
+
+def save_mmap_checkpoint(path, state_dict, classes, arch="r3d_18", config=None):
+    """
+    Write weights and label classes to a single safetensors file.
+
+    The label classes, architecture and its config go in the header metadata,
+    so the file is all a loader needs. Tensors are laid out widest dtype
+    first, which keeps every tensor aligned once the file is mapped.
+    """
+    tensors = {name: tensor.detach().cpu().contiguous() for name, tensor in state_dict.items()}
+    order = sorted(tensors, key=lambda name: (-tensors[name].element_size(), name))
+
+    header = {"__metadata__": {
+        "format": "sign-model",
+        "arch": arch,
+        "config": json.dumps(config or {}),
+        "classes": json.dumps([str(c) for c in classes]),
+    }}
+    offset = 0
+    for name in order:
+        tensor = tensors[name]
+        if tensor.dtype not in _DTYPE_CODES:
+            raise ValueError(f"Unsupported dtype for {name}: {tensor.dtype}")
+        nbytes = tensor.numel() * tensor.element_size()
+        header[name] = {"dtype": _DTYPE_CODES[tensor.dtype], "shape": list(tensor.shape),
+                        "data_offsets": [offset, offset + nbytes]}
+        offset += nbytes
+
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    header_bytes += b" " * (-len(header_bytes) % 8)  # Data section starts 8-byte aligned
+
+    # Write then rename, so a worker starting mid-save never maps a partial file
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(len(header_bytes).to_bytes(8, "little"))
+        f.write(header_bytes)
+        for name in order:
+            f.write(tensors[name].numpy().tobytes())
+    os.replace(tmp_path, path)
+
+def read_mmap_checkpoint(path):
+    """
+    Map a checkpoint and return (state_dict, metadata) without copying the weights.
+
+    The file is mapped copy-on-write: every tensor is a view of the mapping,
+    so processes loading the same file share its page-cache pages, and a
+    stray in-place write only copies the touched page. metadata holds
+    "arch", "config" and "classes" (a numpy array, like LabelEncoder.classes_).
+    """
+    with open(path, "rb") as f:
+        header_length = int.from_bytes(f.read(8), "little")
+        header = json.loads(f.read(header_length))
+    raw_metadata = header.pop("__metadata__", {})
+
+    data_start = 8 + header_length
+    mapping = np.memmap(path, dtype=np.uint8, mode="c")
+    state_dict = {}
+    for name, info in header.items():
+        start, end = info["data_offsets"]
+        array = mapping[data_start + start:data_start + end].view(_NUMPY_DTYPES[info["dtype"]])
+        state_dict[name] = torch.from_numpy(array.reshape(info["shape"]))
+
+    metadata = {
+        "arch": raw_metadata.get("arch", "r3d_18"),
+        "config": json.loads(raw_metadata.get("config", "{}")),
+        "classes": np.array(json.loads(raw_metadata.get("classes", "[]"))),
+    }
+    return state_dict, metadata
@@ -1,48 +1,35 @@
 import torch
-import joblib
-from torchvision.models.video import r3d_18, R3D_18_Weights
-from torchvision import transforms
 from decord import VideoReader, cpu
-import numpy as np
+from sign_models import load_sign_model_and_classes
+from preprocess import ClipBuffer
+from sampling import sample_frames
 
 # Set device
 device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
-# Fast transform (batch-friendly)
-transform = transforms.Compose([
-    transforms.Resize((112, 112)),
-])
+# Reused input buffers, one per frame count
+clip_buffers = {}
 
-def load_video_fast(video_path, max_frames=16):
+def load_video_fast(video_path, max_frames=16, sampler="uniform"):
     vr = VideoReader(video_path, ctx=cpu(0))
-    total_frames = len(vr)
 
-    if total_frames < max_frames:
-        indices = np.linspace(0, total_frames - 1, max_frames).astype(int)
-    else:
-        indices = np.linspace(0, total_frames - 1, max_frames).astype(int)
+    # "adaptive" keeps max_frames, placed where the signer moves
+    indices, frames, order = sample_frames(vr, max_frames, sampler)  # frames: (N, H, W, C)
+    if len(indices) not in clip_buffers:
+        clip_buffers[len(indices)] = ClipBuffer(batch_size=1, max_frames=len(indices))
+    buffer = clip_buffers[len(indices)]
+    buffer.fill(0, frames, order)  # uint8 resize, then scaled into the reused float buffer
+    return buffer.batch(1)  # (1, C, T, H, W)
 
-    frames = vr.get_batch(indices).asnumpy()  # (T, H, W, C)
-    frames = torch.from_numpy(frames).permute(3, 0, 1, 2).float() / 255.0  # (C, T, H, W)
-    frames = transform(frames)
-    return frames.unsqueeze(0)  # (1, C, T, H, W)
-
-def predict_sign_video_top3(video_path, model_path, label_encoder_path, max_frames=16):
-    # Load label encoder
-    le = joblib.load(label_encoder_path)
-
-    # Load model
-    weights = R3D_18_Weights.DEFAULT
-    model = r3d_18(weights=weights)
-    model.fc = torch.nn.Linear(model.fc.in_features, len(le.classes_))
-    model.load_state_dict(torch.load(model_path, map_location=device))
-    model = model.to(device).eval()
+def predict_sign_video_top3(video_path, model_path, label_encoder_path, max_frames=16, sampler="uniform"):
+    # Load model and labels (maps sign_language_model.safetensors when it exists, else .pth + label encoder)
+    model, classes = load_sign_model_and_classes(model_path, label_encoder_path, device)
 
     if device.type == 'cuda':
         model = model.half()
 
     # Load and preprocess video
-    video = load_video_fast(video_path, max_frames)
+    video = load_video_fast(video_path, max_frames, sampler)
     video = video.to(device)
     if device.type == 'cuda':
         video = video.half()
@@ -55,11 +42,11 @@ def predict_sign_video_top3(video_path, model_path, label_encoder_path, max_fram
 
     print("\n🔍 Top 3 Predictions:")
     for i in range(3):
-        label = le.inverse_transform([top_indices[i].item()])[0]
+        label = classes[top_indices[i].item()]
         confidence = top_probs[i].item() * 100
         print(f"{i + 1}. {label}: {confidence:.2f}%")
 
-    return le.inverse_transform([top_indices[0].item()])[0]
+    return classes[top_indices[0].item()]
 
 # Example usage
 if __name__ == "__main__":
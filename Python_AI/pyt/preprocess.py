@@ -0,0 +1,65 @@
+import numpy as np
+import torch
+import torch.nn.functional as F
+
+class ClipBuffer:
+    """
+    Reusable (B, C, T, H, W) float32 model input fed from decoded uint8 clips.
+
+    The whole (T, H, W, C) clip is resized in one antialiased bilinear call
+    while still uint8 (the same filter transforms.Resize applies to float
+    tensors), then scaled and optionally normalized straight into the
+    preallocated batch. Nothing is ever converted to float at full
+    resolution, and the float input is never reallocated; the only per-clip
+    allocation is the small uint8 resize output. `tensor` shares memory with
+    `array`.
+    """
+
+    def __init__(self, batch_size=1, max_frames=16, size=(112, 112), mean=None, std=None):
+        self.batch_size = batch_size
+        self.max_frames = max_frames
+        self.size = size
+        height, width = size
+        self.array = np.empty((batch_size, 3, max_frames, height, width), dtype=np.float32)
+        self.tensor = torch.from_numpy(self.array)
+
+        # x * scale + offset == (x / 255 - mean) / std, per channel
+        mean = np.zeros(3, dtype=np.float32) if mean is None else np.asarray(mean, dtype=np.float32)
+        std = np.ones(3, dtype=np.float32) if std is None else np.asarray(std, dtype=np.float32)
+        self._scale = torch.from_numpy((1.0 / (255.0 * std)).reshape(3, 1, 1, 1).astype(np.float32))
+        self._offset = torch.from_numpy((-mean / std).reshape(3, 1, 1, 1).astype(np.float32))
+        self._normalize = bool(self._offset.any())
+
+    def _resized(self, frames, order=None):
+        """
+        Resize a (T, H, W, C) uint8 clip to a (T, C, h, w) uint8 tensor (channels-last memory).
+
+        With `order`, the clip is frames[order], taken after the resize so
+        repeated frames are copied small.
+        """
+        frames_count, src_height, src_width, channels = frames.shape
+        if order is not None:
+            frames_count = len(order)
+        if frames_count != self.max_frames or channels != 3:
+            raise ValueError(f"Expected ({self.max_frames}, H, W, 3) frames, got {frames_count} of {frames.shape}")
+
+        # Permuting the (T, H, W, C) array gives a channels-last view, the fast path for uint8 resize
+        clip = torch.from_numpy(np.ascontiguousarray(frames)).permute(0, 3, 1, 2)
+        if (src_height, src_width) != tuple(self.size):
+            clip = F.interpolate(clip, size=self.size, mode="bilinear", align_corners=False, antialias=True)
+        return clip if order is None else clip[torch.from_numpy(np.asarray(order, dtype=np.int64))]
+
+    def resize(self, frames):
+        """Resize a decoded (T, H, W, C) uint8 clip into a new (T, h, w, C) uint8 array."""
+        return np.ascontiguousarray(self._resized(frames).permute(0, 2, 3, 1).numpy())
+
+    def fill(self, index, frames, order=None):
+        """Resize and scale one decoded (T, H, W, C) uint8 clip (frames[order], if given) into batch slot `index`."""
+        dst = self.tensor[index]  # (C, T, H, W)
+        torch.mul(self._resized(frames, order).permute(1, 0, 2, 3), self._scale, out=dst)
+        if self._normalize:
+            dst.add_(self._offset)
+
+    def batch(self, count=None):
+        """The first `count` filled clips as a (count, C, T, H, W) tensor view."""
+        return self.tensor[:count or self.batch_size]
@@ -0,0 +1,81 @@
+import numpy as np
+
+def uniform_indices(total_frames, num_frames=16):
+    """Evenly spaced frame indices over the whole clip (the original sampler)."""
+    return np.linspace(0, total_frames - 1, num_frames).astype(int)
+
+def motion_profile(frames, probe_size=32):
+    """
+    Cheap motion estimate from already decoded (T, H, W, C) uint8 frames.
+
+    Frames are strided down to about `probe_size` pixels on the short side
+    first, so this costs little next to the decode. Returns motion, where
+    motion[i] is the mean absolute grey-level difference between frames i
+    and i + 1.
+    """
+    step = max(1, min(frames.shape[1:3]) // probe_size)
+    grey = frames[:, ::step, ::step].astype(np.int16).sum(axis=3)
+    return np.abs(np.diff(grey, axis=0)).mean(axis=(1, 2)) / 3.0
+
+def adaptive_indices(total_frames, probe_indices, motion, max_frames=16, min_frames=None,
+                     idle_ratio=0.15, low_activity=0.3, floor=0.25):
+    """
+    Concentrate samples where the signer is moving.
+
+    Idle lead-in and lead-out (probe intervals below `idle_ratio` of the peak
+    motion) are trimmed, then frames are placed by inverse-CDF sampling of the
+    motion inside the active span; `floor` keeps some samples in slower
+    stretches.
+
+    With `min_frames` set, a clip that is mostly still inside its active span
+    (mean motion there under `low_activity` of the peak, e.g. a held pose with
+    one brief movement) gets `min_frames` samples instead of `max_frames`.
+    Both are relative to the clip's own peak, so the hands' share of the frame
+    does not matter. Off by default: models are trained on `max_frames`.
+    """
+    if len(motion) == 0 or motion.max() <= 0:
+        return uniform_indices(total_frames, min_frames or max_frames)
+
+    active = np.flatnonzero(motion >= idle_ratio * motion.max())
+    first, last = active[0], active[-1]
+    start, end = probe_indices[first], probe_indices[last + 1]
+
+    num_frames = max_frames
+    if min_frames and motion[first:last + 1].mean() < low_activity * motion.max():
+        num_frames = min_frames
+
+    # Piecewise-constant motion density over the active span, sampled by inverse CDF
+    edges = probe_indices[first:last + 2].astype(np.float64)
+    density = motion[first:last + 1] + floor * motion[first:last + 1].mean()
+    cdf = np.concatenate([[0.0], np.cumsum(density * np.diff(edges))])
+    targets = (np.arange(num_frames) + 0.5) / num_frames * cdf[-1]
+    positions = np.interp(targets, cdf, edges)
+    return np.clip(np.round(positions), start, end).astype(int)
+
+def sample_frames(vr, max_frames=16, sampler="uniform", min_frames=None, probe_frames=None):
+    """
+    Decode a clip from an open VideoReader under the named sampler
+    ("uniform" or "adaptive"). Returns (indices, frames, order): the input
+    frame indices, the decoded (N, H, W, C) uint8 frames, and the positions
+    in `frames` that make up the input (None: all of them, in order). Pass
+    `order` to ClipBuffer.fill, so a repeated frame is only copied after the
+    resize, never at full resolution.
+
+    The adaptive sampler decodes `probe_frames` evenly spaced candidates
+    (default `max_frames`, the uniform sampler's frames) in one pass,
+    estimates motion from them and keeps the candidate nearest each frame
+    adaptive_indices() asks for. With the default it decodes exactly what
+    the uniform sampler does; more candidates place frames more finely, but
+    every extra frame is a full-resolution decode.
+    """
+    total_frames = len(vr)
+    if sampler == "uniform":
+        indices = uniform_indices(total_frames, max_frames)
+        return indices, vr.get_batch(indices).asnumpy(), None
+    if sampler == "adaptive":
+        candidates = np.unique(uniform_indices(total_frames, min(total_frames, probe_frames or max_frames)))
+        decoded = vr.get_batch(candidates).asnumpy()
+        targets = adaptive_indices(total_frames, candidates, motion_profile(decoded), max_frames, min_frames)
+        order = np.abs(candidates[None, :] - targets[:, None]).argmin(axis=1)
+        return candidates[order], decoded, order
+    raise ValueError(f"Unknown sampler: {sampler}")
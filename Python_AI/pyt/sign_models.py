@@ -0,0 +1,117 @@
+import os
+import joblib
+import torch
+import torch.nn as nn
+from torchvision.models.video import r3d_18, R3D_18_Weights, mc3_18, MC3_18_Weights
+from mmap_checkpoint import MMAP_CHECKPOINT_EXTENSION, mmap_checkpoint_path, read_mmap_checkpoint
+
+def _conv2plus1d(in_channels, out_channels, stride):
+    """Factorised (2+1)D block: spatial 1x3x3 conv followed by temporal 3x1x1 conv."""
+    t_stride, s_stride = stride
+    return nn.Sequential(
+        nn.Conv3d(in_channels, out_channels, kernel_size=(1, 3, 3),
+                  stride=(1, s_stride, s_stride), padding=(0, 1, 1), bias=False),
+        nn.BatchNorm3d(out_channels),
+        nn.ReLU(inplace=True),
+        nn.Conv3d(out_channels, out_channels, kernel_size=(3, 1, 1),
+                  stride=(t_stride, 1, 1), padding=(1, 0, 0), bias=False),
+        nn.BatchNorm3d(out_channels),
+        nn.ReLU(inplace=True),
+    )
+
+class SignStudent3D(nn.Module):
+    """Compact (2+1)D student network distilled from the R3D-18 teacher."""
+
+    def __init__(self, num_classes, widths=(24, 48, 96, 192), dropout=0.3):
+        super().__init__()
+        self.widths = tuple(widths)
+        strides = [(1, 2), (1, 2), (2, 2), (2, 2)]
+        layers = []
+        in_channels = 3
+        for width, stride in zip(self.widths, strides):
+            layers.append(_conv2plus1d(in_channels, width, stride))
+            in_channels = width
+        self.features = nn.Sequential(*layers)
+        self.pool = nn.AdaptiveAvgPool3d(1)
+        self.dropout = nn.Dropout(dropout)
+        self.fc = nn.Linear(in_channels, num_classes)
+
+    def forward(self, x):  # x: (B, C, T, H, W)
+        x = self.features(x)
+        x = self.pool(x).flatten(1)
+        return self.fc(self.dropout(x))
+
+def build_model(arch, num_classes, pretrained=False, **config):
+    """Build a sign classifier by architecture name."""
+    if arch == "r3d_18":
+        model = r3d_18(weights=R3D_18_Weights.DEFAULT if pretrained else None)
+        model.fc = nn.Linear(model.fc.in_features, num_classes)
+    elif arch == "mc3_18":
+        model = mc3_18(weights=MC3_18_Weights.DEFAULT if pretrained else None)
+        model.fc = nn.Linear(model.fc.in_features, num_classes)
+    elif arch == "student":
+        model = SignStudent3D(num_classes, **config)
+    else:
+        raise ValueError(f"Unknown model architecture: {arch}")
+    return model
+
+def student_checkpoint(model):
+    """Wrap a student's weights with the metadata needed to rebuild it."""
+    return {
+        "arch": "student",
+        "config": {"widths": list(model.widths)},
+        "state_dict": model.state_dict(),
+    }
+
+def load_sign_model(model_path, num_classes, device, arch="r3d_18"):
+    """
+    Load a trained sign classifier ready for inference.
+
+    Plain state dicts (as written by train_pytorch.py) are loaded into `arch`;
+    checkpoints carrying an "arch" key (e.g. the distilled student) and
+    .safetensors files rebuild the architecture they describe.
+    """
+    if model_path.endswith(MMAP_CHECKPOINT_EXTENSION):
+        return load_mmap_sign_model(model_path, device)[0]
+
+    checkpoint = torch.load(model_path, map_location=device)
+    config = {}
+    if isinstance(checkpoint, dict) and "arch" in checkpoint and "state_dict" in checkpoint:
+        arch = checkpoint["arch"]
+        config = checkpoint.get("config", {})
+        checkpoint = checkpoint["state_dict"]
+
+    model = build_model(arch, num_classes, **config)
+    model.load_state_dict(checkpoint)
+    return model.to(device).eval()
+
+def load_mmap_sign_model(model_path, device):
+    """Load a .safetensors checkpoint backed by the mapped file; returns (model, classes)."""
+    state_dict, metadata = read_mmap_checkpoint(model_path)
+    # Build on the meta device so no throwaway weights are allocated, then adopt the mapped tensors as-is
+    with torch.device("meta"):
+        model = build_model(metadata["arch"], len(metadata["classes"]), **metadata["config"])
+    model.load_state_dict(state_dict, assign=True)
+    return model.to(device).eval(), metadata["classes"]
+
+def load_sign_model_and_classes(model_path, label_encoder_path, device, arch="r3d_18"):
+    """
+    Load a model and its label classes, preferring the memory-mapped checkpoint.
+
+    A .safetensors `model_path` is used as is, with the classes from its
+    metadata. For a .pth, a .safetensors file next to it is preferred only if
+    it is at least as new; an older one is left over from a previous model,
+    so this falls back to the .pth checkpoint and the label encoder pickle.
+    """
+    mmap_path = mmap_checkpoint_path(model_path)
+    if mmap_path == model_path:
+        return load_mmap_sign_model(mmap_path, device)
+    if os.path.exists(mmap_path):
+        if not os.path.exists(model_path) or os.path.getmtime(mmap_path) >= os.path.getmtime(model_path):
+            return load_mmap_sign_model(mmap_path, device)
+        print(f"⚠️ {mmap_path} is older than {model_path}, loading the .pth and label encoder instead")
+    classes = joblib.load(label_encoder_path).classes_
+    return load_sign_model(model_path, len(classes), device, arch=arch), classes
+
+def count_parameters(model):
+    return sum(p.numel() for p in model.parameters())
@@ -1,9 +1,8 @@
 import os
 import cv2
 import re
-import mediapipe as mp
 from glob import glob
-from moviepy import concatenate_videoclips, VideoFileClip
+from build_trim_index import load_trim_index, entry_is_current
 
 def clean_text(text):
     """Clean text to match labels."""
@@ -49,42 +48,25 @@ def match_sentence_to_videos(sentence, label_map):
             raise ValueError(f"❌ No matching label found for word/phrase: '{words[idx]}'")
     return matched_labels
 
-# Initialize MediaPipe for hand tracking
-mp_hands = mp.solutions.hands
-hands = mp_hands.Hands(min_detection_confidence=0.5, min_tracking_confidence=0.5)
-
-def detect_hands(frame):
-    """Detect hands in a frame using MediaPipe."""
-    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    results = hands.process(frame_rgb)
-    return results
-
-def trim_video_with_hands(video_path, start_frame, end_frame, output_path="trimmed_video.mov"):
-    """Trim video based on detected hand movements."""
-    cap = cv2.VideoCapture(video_path)
-    fps = cap.get(cv2.CAP_PROP_FPS)
-    fourcc = cv2.VideoWriter_fourcc(*'XVID')
-    out = cv2.VideoWriter(output_path, fourcc, fps, (1920, 1080))
-
-    cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
-
-    frame_count = start_frame
-    while cap.isOpened():
+def write_active_span(cap, out, start, end, size):
+    """Copy frames [start, end] from an open capture into the writer, resizing if needed."""
+    cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+    for _ in range(start, end + 1):
         ret, frame = cap.read()
-        if not ret or frame_count > end_frame:
+        if not ret:
             break
-
-        results = detect_hands(frame)
-        if results.multi_hand_landmarks:
-            out.write(frame)
-        frame_count += 1
-
-    cap.release()
-    out.release()
-    print(f"✅ Trimmed video saved to: {output_path}")
-
-def generate_sentence_video(sentence, dataset_path):
-    """Generate video by matching sentence to labels and trimming based on hand motion."""
+        if (frame.shape[1], frame.shape[0]) != size:
+            frame = cv2.resize(frame, size)
+        out.write(frame)
+
+def generate_sentence_video(sentence, dataset_path, output_path="output_sentence.mov"):
+    """
+    Generate video by matching sentence to labels and joining each clip's active hand span.
+
+    Spans come from the trim index built offline by build_trim_index.py, so no
+    hand detection runs here. Clips missing from the index, or changed since
+    it was built, are used whole.
+    """
     label_map = extract_label_map(dataset_path)
     print(f"📚 Found {len(label_map)} labels in dataset.")
 
@@ -93,21 +75,38 @@ def generate_sentence_video(sentence, dataset_path):
     for phrase, path in matched:
         print(f"  ✅ '{phrase}' → {path}")
 
-    video_paths = []
+    trim_index = load_trim_index(dataset_path)
+    if not trim_index:
+        print("⚠️ No trim index found, using whole clips. Run build_trim_index.py to build it.")
+
+    out, size = None, None
     for _, path in matched:
-        # Assume hand movement occurs from frame 10 to 90 (just as an example)
-        start_frame = 10
-        end_frame = 90
-
-        # Trim video based on hand movement
-        temp_output = "temp_trimmed_video.mov"
-        trim_video_with_hands(path, start_frame, end_frame, temp_output)
-        video_paths.append(temp_output)
-
-    # Merge the trimmed video clips
-    final_clip = concatenate_videoclips([VideoFileClip(vp) for vp in video_paths], method="compose")
-    final_clip.write_videofile("output_sentence.mov", codec="libx264", fps=24, threads=4, preset='ultrafast')
-    print(f"✅ Final video saved to: output_sentence.mov")
+        cap = cv2.VideoCapture(path)
+        if not cap.isOpened():
+            print(f"⚠️ Failed to open {path}")
+            continue
+
+        if out is None:
+            # Output takes the first clip's frame rate and size
+            fps = cap.get(cv2.CAP_PROP_FPS) or 24
+            size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+            out = cv2.VideoWriter(output_path, cv2.VideoWriter_fourcc(*'mp4v'), fps, size)
+
+        span = trim_index.get(os.path.normpath(path))
+        if span is not None and not entry_is_current(span, path):
+            # A replaced clip's old span may not even overlap the new clip
+            print(f"⚠️ Trim index is stale for {path}, using the whole clip. Re-run build_trim_index.py.")
+            span = None
+        if span is None:
+            start, end = 0, int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) - 1
+        else:
+            start, end = span["start"], span["end"]
+        write_active_span(cap, out, start, end, size)
+        cap.release()
+
+    if out is not None:
+        out.release()
+        print(f"✅ Final video saved to: {output_path}")
 
 # Example usage
 if __name__ == "__main__":
@@ -11,6 +11,7 @@ from torchvision.models.video import r3d_18, R3D_18_Weights
 from sklearn.preprocessing import LabelEncoder
 from sklearn.model_selection import train_test_split
 import numpy as np
+from mmap_checkpoint import save_mmap_checkpoint
 
 # Check if CUDA is available
 device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
@@ -155,6 +156,8 @@ def train_model(dataset_path, batch_size=4, epochs=10, lr=1e-4):
     # Save model and encoder
     torch.save(model.state_dict(), "sign_language_model.pth")
     joblib.dump(le, "label_encoder.pkl")
+    # Same weights plus the label classes in one file that inference workers memory-map and share
+    save_mmap_checkpoint("sign_language_model.safetensors", model.state_dict(), le.classes_)
     print("✅ Model and label encoder saved!")
 
     return model, le
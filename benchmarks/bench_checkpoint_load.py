@@ -0,0 +1,136 @@
+"""
+Cold-start time and combined memory of N worker processes loading the same model.
+
+Each format is loaded by `--workers` fresh processes at once, the way
+several server workers would start. Every worker reports its load time and
+its proportional set size (PSS: shared pages are split between the
+processes mapping them), so the PSS sum is what the workers really cost
+together. Linux only, as PSS comes from /proc/self/smaps_rollup.
+
+    python benchmarks/bench_checkpoint_load.py --workers 4
+    python benchmarks/bench_checkpoint_load.py --workers 4 --arch student
+
+A worker that crashes or hangs fails its format's case after --timeout
+seconds instead of stalling the run.
+"""
+import argparse
+import multiprocessing
+import os
+import queue as queue_module
+import statistics
+import sys
+import tempfile
+import time
+
+from harness import REPO_ROOT, write_results
+
+NUM_CLASSES = 50
+
+def _pss_bytes():
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            if line.startswith("Pss:"):
+                return int(line.split()[1]) * 1024
+    raise KeyError("Pss")
+
+def _worker(model_path, label_encoder_path, arch, barrier, queue):
+    import torch
+    sys.path.insert(0, os.path.join(REPO_ROOT, "Python_AI", "pyt"))
+    from sign_models import load_sign_model_and_classes
+
+    baseline = _pss_bytes()
+    barrier.wait()  # Start loading together, like workers forked by one server start
+    start = time.perf_counter()
+    model, classes = load_sign_model_and_classes(model_path, label_encoder_path, torch.device("cpu"), arch=arch)
+    with torch.no_grad():
+        model(torch.zeros(1, 3, 16, 112, 112))  # Touch every weight once
+    load_ms = (time.perf_counter() - start) * 1000
+    barrier.wait()  # Measure while every worker still holds its model
+    queue.put({"load_ms": load_ms, "pss_bytes": _pss_bytes() - baseline})
+    barrier.wait()
+
+def write_checkpoints(directory, arch):
+    import joblib
+    import numpy as np
+    import torch
+    from sklearn.preprocessing import LabelEncoder
+    sys.path.insert(0, os.path.join(REPO_ROOT, "Python_AI", "pyt"))
+    from sign_models import build_model, student_checkpoint
+    from mmap_checkpoint import save_mmap_checkpoint
+
+    model = build_model(arch, NUM_CLASSES)
+    le = LabelEncoder().fit(np.array([f"sign{i:02d}" for i in range(NUM_CLASSES)]))
+    pth_dir, mmap_dir = os.path.join(directory, "pth"), os.path.join(directory, "mmap")
+    os.makedirs(pth_dir)
+    os.makedirs(mmap_dir)
+    # Same formats the training scripts write: a plain state dict for the teachers, the wrapped student checkpoint
+    checkpoint = student_checkpoint(model) if arch == "student" else model.state_dict()
+    config = checkpoint["config"] if arch == "student" else None
+    torch.save(checkpoint, os.path.join(pth_dir, "sign_language_model.pth"))
+    joblib.dump(le, os.path.join(pth_dir, "label_encoder.pkl"))
+    save_mmap_checkpoint(os.path.join(mmap_dir, "sign_language_model.safetensors"), model.state_dict(), le.classes_,
+                         arch=arch, config=config)
+    return {
+        "pth": (os.path.join(pth_dir, "sign_language_model.pth"), os.path.join(pth_dir, "label_encoder.pkl")),
+        "safetensors": (os.path.join(mmap_dir, "sign_language_model.safetensors"), None),
+    }
+
+def _collect(processes, queue, timeout):
+    """One row per worker, or raise once a worker exits with an error or `timeout` seconds pass."""
+    rows, deadline = [], time.monotonic() + timeout
+    while len(rows) < len(processes):
+        try:
+            rows.append(queue.get(timeout=1))
+        except queue_module.Empty:
+            failed = [process.exitcode for process in processes if process.exitcode not in (None, 0)]
+            if failed:
+                raise RuntimeError(f"worker exited with code {failed[0]}")
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"{len(processes) - len(rows)} worker(s) did not report within {timeout:.0f}s")
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare .pth and memory-mapped checkpoint loading across workers.")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--arch", default="r3d_18", help="r3d_18, mc3_18 or student")
+    parser.add_argument("--timeout", type=float, default=300.0, help="Seconds to wait for the workers of one format")
+    parser.add_argument("--out", default=os.path.join(REPO_ROOT, "benchmarks", "results", "checkpoint_load.json"))
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    print(f"{'case':<45}{'median load ms':>16}{'total PSS MiB':>16}")
+    with tempfile.TemporaryDirectory() as directory:
+        for fmt, (model_path, label_encoder_path) in write_checkpoints(directory, args.arch).items():
+            # The barrier timeout releases the surviving workers if one of them dies
+            barrier, queue = context.Barrier(args.workers, timeout=args.timeout), context.Queue()
+            processes = [context.Process(target=_worker, args=(model_path, label_encoder_path, args.arch, barrier, queue))
+                         for _ in range(args.workers)]
+            for process in processes:
+                process.start()
+            case_id = f"model.load_workers[{args.arch},{fmt},workers={args.workers}]"
+            try:
+                rows = _collect(processes, queue, args.timeout)
+            except (RuntimeError, TimeoutError) as e:
+                for process in processes:
+                    process.terminate()
+                results[case_id] = {"error": str(e)}
+                print(f"{case_id:<45} ERROR: {e}")
+                continue
+            finally:
+                for process in processes:
+                    process.join()
+
+            results[case_id] = {
+                "median_ms": statistics.median(row["load_ms"] for row in rows),
+                "total_pss_bytes": sum(row["pss_bytes"] for row in rows),
+                "workers": args.workers,
+            }
+            print(f"{case_id:<45}{results[case_id]['median_ms']:>16.1f}{results[case_id]['total_pss_bytes'] / 2 ** 20:>16.1f}")
+
+    write_results(args.out, results)
+    if any("error" in row for row in results.values()):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
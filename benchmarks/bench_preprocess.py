@@ -0,0 +1,104 @@
+"""
+Peak memory and time of the fused uint8 preprocessing against the loaders it replaced.
+
+Each implementation runs in a fresh process on the same decoded clip, so
+peak RSS is not polluted by another implementation's allocator state.
+
+    python benchmarks/bench_preprocess.py --out benchmarks/results/preprocess.json
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+
+from harness import REPO_ROOT, time_call, measure_peak_rss, write_results
+
+MAX_FRAMES = 16
+
+# Reference copies of the pre-ClipBuffer loaders, minus decoding.
+
+def legacy_load_video_fast(frames):
+    """predict_fast.load_video_fast: float32 at full resolution, then transforms.Resize."""
+    import torch
+    from torchvision import transforms
+    transform = transforms.Compose([transforms.Resize((112, 112))])
+    video = torch.from_numpy(frames).permute(3, 0, 1, 2).float() / 255.0
+    return transform(video).unsqueeze(0)
+
+def legacy_video_to_text(frames):
+    """sign_to_text.video_to_text: same as load_video_fast, transform rebuilt per call."""
+    import torch
+    from torchvision import transforms
+    transform = transforms.Compose([
+        transforms.Resize((112, 112)),
+    ])
+    video = torch.from_numpy(frames).permute(3, 0, 1, 2).float() / 255.0
+    video = transform(video)
+    return video.unsqueeze(0).to(torch.device("cpu"))
+
+def legacy_load_video_ultra_fast(frames):
+    """faster.load_video_ultra_fast: per-frame cv2.resize loop, np.stack, then float32."""
+    import cv2
+    import numpy as np
+    import torch
+    resized = np.stack([cv2.resize(f, (112, 112)) for f in frames])
+    video = torch.from_numpy(resized).permute(3, 0, 1, 2).float() / 255.0
+    return video.unsqueeze(0)
+
+def make_fused():
+    from preprocess import ClipBuffer
+    buffer = ClipBuffer(batch_size=1, max_frames=MAX_FRAMES)
+
+    def fused_clip_buffer(frames):
+        buffer.fill(0, frames)
+        return buffer.batch(1)
+    return fused_clip_buffer
+
+IMPLEMENTATIONS = {
+    "load_video_fast": lambda: legacy_load_video_fast,
+    "video_to_text": lambda: legacy_video_to_text,
+    "load_video_ultra_fast": lambda: legacy_load_video_ultra_fast,
+    "fused_clip_buffer": make_fused,
+}
+
+def _child(name, width, height, repeat, queue):
+    import numpy as np
+    import torch
+    torch.set_num_threads(1)  # Keep timings comparable between single- and multi-threaded paths
+    sys.path.insert(0, os.path.join(REPO_ROOT, "Python_AI", "pyt"))
+
+    frames = np.random.default_rng(0).integers(0, 256, size=(MAX_FRAMES, height, width, 3), dtype=np.uint8)
+    fn = IMPLEMENTATIONS[name]()
+    fn(frames)  # Warm up: lazy imports, first-touch of reusable buffers
+
+    peak = measure_peak_rss(lambda: fn(frames))
+    row = time_call(lambda: fn(frames), repeat=repeat, warmup=0)
+    row["peak_rss_delta_bytes"] = peak
+    queue.put(row)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare preprocessing implementations on peak memory and time.")
+    parser.add_argument("--resolutions", default="640x480,1280x720,1920x1080")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--out", default=os.path.join(REPO_ROOT, "benchmarks", "results", "preprocess.json"))
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    print(f"{'case':<55}{'median ms':>12}{'peak MiB':>12}")
+    for resolution in args.resolutions.split(","):
+        width, height = (int(v) for v in resolution.split("x"))
+        for name in IMPLEMENTATIONS:
+            queue = context.Queue()
+            process = context.Process(target=_child, args=(name, width, height, args.repeat, queue))
+            process.start()
+            row = queue.get()
+            process.join()
+            case_id = f"preprocess.{name}[{width}x{height}]"
+            results[case_id] = row
+            print(f"{case_id:<55}{row['median_ms']:>12.2f}{row['peak_rss_delta_bytes'] / 2 ** 20:>12.1f}")
+
+    write_results(args.out, results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Uniform against motion-adaptive frame sampling: per-clip latency and accuracy.
+
+Latency covers sampling + decode + preprocess + forward for each fixture
+clip. Accuracy needs a labelled dataset laid out like the training data
+(<category>/<label>/*.mov) and a trained model:
+
+    python benchmarks/bench_sampling.py --quick
+    python benchmarks/bench_sampling.py --dataset path/to/dataset3 \
+        --model sign_language_model.pth --label-encoder label_encoder.pkl
+
+Only enable SIGN_ADAPTIVE_MIN_FRAMES if "adaptive_min8" matches the
+uniform sampler's accuracy here.
+"""
+import argparse
+import os
+import re
+import sys
+from glob import glob
+
+import torch
+from decord import VideoReader, cpu
+
+from fixtures import RESOLUTIONS, LENGTHS, ensure_clips
+from harness import REPO_ROOT, run_cases, write_results, git_commit
+
+sys.path.insert(0, os.path.join(REPO_ROOT, "Python_AI", "pyt"))
+from sign_models import build_model, load_sign_model_and_classes  # noqa: E402
+from preprocess import ClipBuffer  # noqa: E402
+from sampling import sample_frames  # noqa: E402
+
+# name -> (sampler, min_frames); "adaptive_min8" is the opt-in short-clip mode to calibrate
+SAMPLERS = {
+    "uniform": ("uniform", None),
+    "adaptive": ("adaptive", None),
+    "adaptive_min8": ("adaptive", 8),
+}
+MAX_FRAMES = 16
+
+def predict(model, buffers, path, sampler, device):
+    """One clip through the sign_to_text steps; returns (class index, frames used)."""
+    vr = VideoReader(path, ctx=cpu(0))
+    indices, frames, order = sample_frames(vr, MAX_FRAMES, *SAMPLERS[sampler])
+    if len(indices) not in buffers:
+        buffers[len(indices)] = ClipBuffer(batch_size=1, max_frames=len(indices))
+    buffer = buffers[len(indices)]
+    buffer.fill(0, frames, order)
+    with torch.no_grad():
+        return model(buffer.batch(1).to(device)).argmax(1).item(), len(indices)
+
+def latency_cases(clips, model, device):
+    buffers = {}
+    for (width, height, frames), path in clips.items():
+        for sampler in SAMPLERS:
+            def setup(path=path, sampler=sampler):
+                return lambda: predict(model, buffers, path, sampler, device)
+            yield f"sampling.end_to_end[{sampler},{width}x{height},{frames}f]", setup
+
+def labelled_clips(dataset_path):
+    """(path, label) pairs using train_pytorch.load_videos_and_labels' layout and label cleaning."""
+    pairs = []
+    for label_path in sorted(glob(os.path.join(dataset_path, "*", "*"))):
+        if os.path.isdir(label_path):
+            label = re.sub(r'[\d.]', '', os.path.basename(label_path))
+            pairs.extend((path, label) for path in sorted(glob(os.path.join(label_path, "*.mov"))))
+    return pairs
+
+def accuracy(model, classes, pairs, device):
+    """Top-1 accuracy and mean frames per clip for each sampler."""
+    index = {label: i for i, label in enumerate(classes)}
+    buffers, results = {}, {}
+    for sampler in SAMPLERS:
+        correct, frames_used = 0, 0
+        for path, label in pairs:
+            predicted, used = predict(model, buffers, path, sampler, device)
+            correct += predicted == index.get(label)
+            frames_used += used
+        results[f"sampling.accuracy[{sampler}]"] = {
+            "top1": correct / len(pairs),
+            "mean_frames": frames_used / len(pairs),
+            "clips": len(pairs),
+        }
+        print(f"{sampler:<10} top-1 {correct / len(pairs):.3f}  mean frames {frames_used / len(pairs):.1f}  ({len(pairs)} clips)")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare uniform and motion-adaptive frame sampling.")
+    parser.add_argument("--dataset", help="Labelled dataset for accuracy (<category>/<label>/*.mov)")
+    parser.add_argument("--model", help="Trained model; a random student is used for latency-only runs")
+    parser.add_argument("--label-encoder", help="Label encoder matching --model (not needed for .safetensors)")
+    parser.add_argument("--arch", default="r3d_18", help="Architecture for plain state dicts")
+    parser.add_argument("--out", help="Result JSON path (default: benchmarks/results/sampling-<commit>.json)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--quick", action="store_true", help="Small fixture grid")
+    args = parser.parse_args()
+
+    device = torch.device("cpu")
+    if args.model:
+        model, classes = load_sign_model_and_classes(args.model, args.label_encoder, device, arch=args.arch)
+    else:
+        classes = None
+        model = build_model("student", 50).to(device).eval()
+
+    clips = ensure_clips(RESOLUTIONS[:2] if args.quick else RESOLUTIONS, LENGTHS[:2] if args.quick else LENGTHS)
+    results = run_cases(latency_cases(clips, model, device), repeat=args.repeat, warmup=1)
+
+    if args.dataset:
+        if classes is None:
+            sys.exit("Accuracy needs --model")
+        results.update(accuracy(model, classes, labelled_clips(args.dataset), device))
+
+    out = args.out or os.path.join(REPO_ROOT, "benchmarks", "results", f"sampling-{git_commit()}.json")
+    write_results(out, results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import os
+import cv2
+import numpy as np
+
+# Default fixture grid: (width, height) x frame counts
+RESOLUTIONS = [(320, 240), (640, 480), (1280, 720), (1920, 1080)]
+LENGTHS = [30, 90, 180]
+
+SKIN_BGR = (96, 140, 200)
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".fixtures")
+
+def _hand_position(t, phase, width, height):
+    """Lissajous path for a synthetic hand, normalised time t in [0, 1]."""
+    x = 0.5 + 0.25 * np.sin(2 * np.pi * (1.5 * t + phase))
+    y = 0.55 + 0.2 * np.sin(2 * np.pi * (2.0 * t + phase / 2))
+    return int(x * width), int(y * height)
+
+def make_sign_clip(path, width, height, frames, fps=30, seed=0, idle_fraction=0.2):
+    """
+    Write a synthetic sign-like clip: a static signer with two moving hands.
+
+    The first and last `idle_fraction` of the clip keep the hands at rest, so
+    fixtures have the idle lead-in/lead-out real recordings have.
+    """
+    rng = np.random.default_rng(seed)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    background = np.empty((height, width, 3), dtype=np.uint8)
+    background[:] = np.linspace(60, 120, width, dtype=np.uint8)[None, :, None]
+    cv2.ellipse(background, (width // 2, int(height * 0.9)), (width // 4, height // 3), 0, 180, 360, (70, 50, 40), -1)
+    cv2.circle(background, (width // 2, int(height * 0.35)), max(4, height // 8), SKIN_BGR, -1)
+
+    hand_radius = max(3, height // 18)
+    rest = [(int(width * 0.35), int(height * 0.95)), (int(width * 0.65), int(height * 0.95))]
+    idle = int(frames * idle_fraction)
+    noise_bank = [rng.integers(0, 8, size=(height, width, 3), dtype=np.uint8) for _ in range(4)]
+
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
+    for i in range(frames):
+        frame = background.copy()
+        if idle <= i < frames - idle:
+            t = (i - idle) / max(1, frames - 2 * idle)
+            hands = [_hand_position(t, 0.0, width, height), _hand_position(t, 0.37, width, height)]
+        else:
+            hands = rest
+        for center in hands:
+            cv2.circle(frame, center, hand_radius, SKIN_BGR, -1)
+        cv2.add(frame, noise_bank[i % len(noise_bank)], dst=frame)
+        writer.write(frame)
+    writer.release()
+    return path
+
+def fixture_name(width, height, frames):
+    return f"sign_{width}x{height}_{frames}f.mp4"
+
+def ensure_clips(resolutions=RESOLUTIONS, lengths=LENGTHS, root=FIXTURE_DIR):
+    """Generate (or reuse) one clip per resolution/length pair. Returns {(w, h, frames): path}."""
+    clips = {}
+    for width, height in resolutions:
+        for frames in lengths:
+            path = os.path.join(root, fixture_name(width, height, frames))
+            if not os.path.exists(path):
+                print(f"Generating fixture {path}")
+                make_sign_clip(path, width, height, frames, seed=width * 1000 + frames)
+            clips[(width, height, frames)] = path
+    return clips
+
+def ensure_phrase_library(labels, width=640, height=480, frames=45, root=FIXTURE_DIR):
+    """Generate a flat `<label>.MOV` clip library in the layout text_to_sign.extract_label_map expects."""
+    library = os.path.join(root, f"phrases_{width}x{height}")
+    for i, label in enumerate(labels):
+        path = os.path.join(library, f"{label}.MOV")
+        if not os.path.exists(path):
+            make_sign_clip(path, width, height, frames, seed=i)
+    return library
@@ -0,0 +1,143 @@
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def time_call(fn, repeat=5, warmup=1):
+    """Run fn warmup + repeat times and summarise wall-clock timings in milliseconds."""
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "median_ms": statistics.median(timings),
+        "min_ms": min(timings),
+        "mean_ms": statistics.fmean(timings),
+        "stdev_ms": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "repeat": repeat,
+    }
+
+def _proc_status_kb(field):
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    raise KeyError(field)
+
+def measure_peak_rss(fn):
+    """
+    Extra peak resident memory (bytes) used while fn runs.
+
+    On Linux the kernel's high-water mark is reset first, so the result is
+    independent of whatever the process peaked at earlier. Elsewhere the
+    growth of ru_maxrss is used, which can under-report.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")  # Reset VmHWM to the current RSS
+        before = _proc_status_kb("VmRSS")
+    except OSError:
+        before = None
+
+    if before is not None:
+        fn()
+        return (_proc_status_kb("VmHWM") - before) * 1024
+
+    import resource
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    fn()
+    grown = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before
+    return grown if platform.system() == "Darwin" else grown * 1024
+
+def run_cases(cases, repeat=5, warmup=1, only=None):
+    """
+    Time every case whose ID starts with one of the `only` prefixes.
+
+    `cases` yields (case_id, setup) pairs; setup() does any untimed preparation
+    and returns the zero-argument callable to time.
+    """
+    results = {}
+    for case_id, setup in cases:
+        if only and not any(case_id.startswith(prefix) for prefix in only):
+            continue
+        try:
+            fn = setup()
+            results[case_id] = time_call(fn, repeat=repeat, warmup=warmup)
+            print(f"{case_id:<60} {results[case_id]['median_ms']:>10.2f} ms")
+        except Exception as e:
+            results[case_id] = {"error": str(e)}
+            print(f"{case_id:<60} ERROR: {e}")
+    return results
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return "unknown"
+
+def run_metadata():
+    meta = {
+        "commit": git_commit(),
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+    try:
+        import torch
+        meta["torch"] = torch.__version__
+        meta["torch_threads"] = torch.get_num_threads()
+    except ImportError:
+        pass
+    return meta
+
+def write_results(path, results, meta=None):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"meta": meta or run_metadata(), "results": results}, f, indent=2, sort_keys=True)
+    print(f"Results written to {path}")
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)
+
+def compare(baseline, current, threshold=0.10, only=None):
+    """
+    Compare two result files case by case on median time.
+
+    Returns a list of (case_id, baseline_ms, current_ms, ratio) for cases that
+    got slower than baseline by more than `threshold`. Cases that raised in
+    the current run, and timed baseline cases missing from it, are returned
+    too, with current_ms and ratio set to None. `only` takes the prefixes the
+    current run was limited to, so cases it skipped are not reported missing.
+    """
+    regressions = []
+    base_results, current_results = baseline["results"], current["results"]
+    for case_id in sorted(set(base_results) | set(current_results)):
+        base, row = base_results.get(case_id), current_results.get(case_id)
+        base_ms = base.get("median_ms") if base else None
+        if row is None:
+            if base_ms is None or (only and not any(case_id.startswith(prefix) for prefix in only)):
+                continue
+            print(f"{case_id:<60} {base_ms:>10.2f} -> {'-':>10}     MISSING")
+            regressions.append((case_id, base_ms, None, None))
+        elif "error" in row:
+            print(f"{case_id:<60} ERROR: {row['error']}")
+            regressions.append((case_id, base_ms, None, None))
+        elif base_ms is not None and "median_ms" in row:
+            ratio = row["median_ms"] / base_ms if base_ms else float("inf")
+            marker = "REGRESSION" if ratio > 1 + threshold else ""
+            print(f"{case_id:<60} {base_ms:>10.2f} -> {row['median_ms']:>10.2f} ms  x{ratio:.2f} {marker}")
+            if marker:
+                regressions.append((case_id, base_ms, row["median_ms"], ratio))
+    return regressions
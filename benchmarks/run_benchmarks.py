@@ -0,0 +1,165 @@
+"""
+Component benchmarks for the sign translation hot paths.
+
+Each case has a stable ID of the form `<stage>.<component>[<params>]`, so
+result files from different commits can be diffed with --compare.
+
+    python benchmarks/run_benchmarks.py --quick
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/abc1234.json
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+import numpy as np
+import torch
+from decord import VideoReader, cpu
+
+from fixtures import RESOLUTIONS, LENGTHS, ensure_clips, ensure_phrase_library
+from harness import REPO_ROOT, run_cases, write_results, load_results, compare, git_commit
+
+sys.path.insert(0, os.path.join(REPO_ROOT, "Flask_server"))
+sys.path.append(os.path.join(REPO_ROOT, "Python_AI", "pyt"))
+from sign_models import build_model, load_sign_model, student_checkpoint  # noqa: E402
+from mmap_checkpoint import save_mmap_checkpoint  # noqa: E402
+from preprocess import ClipBuffer  # noqa: E402
+from text_to_sign import match_best_phrases, merge_videos_opencv  # noqa: E402
+
+NUM_CLASSES = 50
+MAX_FRAMES = 16
+ARCHS = ["r3d_18", "mc3_18", "student"]
+
+def uniform_indices(total_frames, max_frames=MAX_FRAMES):
+    return np.linspace(0, total_frames - 1, max_frames).astype(int)
+
+def decode_cases(clips):
+    for (width, height, frames), path in clips.items():
+        def setup(path=path):
+            def run():
+                vr = VideoReader(path, ctx=cpu(0))
+                vr.get_batch(uniform_indices(len(vr))).asnumpy()
+            return run
+        yield f"decode.decord_sample[{width}x{height},{frames}f]", setup
+
+def preprocess_cases(clips):
+    seen = set()
+    for (width, height, _), path in clips.items():
+        if (width, height) in seen:
+            continue
+        seen.add((width, height))
+
+        def setup(path=path):
+            vr = VideoReader(path, ctx=cpu(0))
+            decoded = vr.get_batch(uniform_indices(len(vr))).asnumpy()
+
+            # Same steps as sign_to_text.video_to_text
+            buffer = ClipBuffer(batch_size=1, max_frames=MAX_FRAMES)
+
+            def run():
+                buffer.fill(0, decoded)
+                buffer.batch(1)
+            return run
+        yield f"preprocess.resize_normalize[{width}x{height}]", setup
+
+def model_load_cases(workdir):
+    for arch in ARCHS:
+        def setup(arch=arch):
+            model = build_model(arch, NUM_CLASSES)
+            path = os.path.join(workdir, f"{arch}.pth")
+            torch.save(student_checkpoint(model) if arch == "student" else model.state_dict(), path)
+            return lambda: load_sign_model(path, NUM_CLASSES, torch.device("cpu"), arch=arch)
+        yield f"model.load[{arch}]", setup
+
+        def setup_mmap(arch=arch):
+            model = build_model(arch, NUM_CLASSES)
+            config = student_checkpoint(model)["config"] if arch == "student" else None
+            path = os.path.join(workdir, f"{arch}.safetensors")
+            save_mmap_checkpoint(path, model.state_dict(), range(NUM_CLASSES), arch=arch, config=config)
+            return lambda: load_sign_model(path, NUM_CLASSES, torch.device("cpu"))
+        yield f"model.load[{arch},safetensors]", setup_mmap
+
+def forward_cases(batch_sizes, device):
+    for arch in ARCHS:
+        for batch_size in batch_sizes:
+            def setup(arch=arch, batch_size=batch_size):
+                model = build_model(arch, NUM_CLASSES).to(device).eval()
+                video = torch.zeros(batch_size, 3, MAX_FRAMES, 112, 112, device=device)
+
+                def run():
+                    with torch.no_grad():
+                        model(video)
+                    if device.type == "cuda":
+                        torch.cuda.synchronize()
+                return run
+            yield f"model.forward[{arch},b={batch_size},{device.type}]", setup
+
+def synthetic_label_map(vocabulary_size=400, phrase_count=200, seed=0):
+    rng = np.random.default_rng(seed)
+    words = [f"w{chr(97 + i % 26)}{chr(97 + i // 26 % 26)}" for i in range(vocabulary_size)]
+    label_map = {word: f"{word}.MOV" for word in words}
+    for _ in range(phrase_count):
+        phrase = " ".join(rng.choice(words, size=rng.integers(2, 4)))
+        label_map[phrase] = f"{phrase}.MOV"
+    return words, label_map
+
+def phrase_cases(sentence_lengths=(8, 32, 128)):
+    words, label_map = synthetic_label_map()
+    rng = np.random.default_rng(1)
+    for length in sentence_lengths:
+        sentence = " ".join(rng.choice(words + ["unmatched"], size=length))
+        yield f"text.match_best_phrases[words={length}]", lambda s=sentence: (lambda: match_best_phrases(s, label_map))
+
+def merge_cases(workdir, clip_counts=(3, 8)):
+    labels = [f"sign{chr(97 + i)}" for i in range(max(clip_counts))]
+    for count in clip_counts:
+        def setup(count=count):
+            library = ensure_phrase_library(labels)
+            paths = [os.path.join(library, f"{label}.MOV") for label in labels[:count]]
+            output = os.path.join(workdir, f"merged_{count}.mp4")
+            return lambda: merge_videos_opencv(paths, output)
+        yield f"video.merge_videos_opencv[640x480,clips={count}]", setup
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the sign translation pipeline stage by stage.")
+    parser.add_argument("--out", help="Result JSON path (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="Baseline result JSON to flag regressions against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed slowdown ratio before flagging (default 0.10)")
+    parser.add_argument("--only", action="append", help="Only run cases whose ID starts with this prefix (repeatable)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--quick", action="store_true", help="Small fixture grid and batch sizes")
+    parser.add_argument("--device", default="cpu")
+    args = parser.parse_args()
+
+    resolutions = RESOLUTIONS[:2] if args.quick else RESOLUTIONS
+    lengths = LENGTHS[:2] if args.quick else LENGTHS
+    batch_sizes = [1, 4] if args.quick else [1, 4, 8]
+    device = torch.device(args.device)
+
+    clips = ensure_clips(resolutions, lengths)
+    with tempfile.TemporaryDirectory() as workdir:
+        cases = [
+            *decode_cases(clips),
+            *preprocess_cases(clips),
+            *model_load_cases(workdir),
+            *forward_cases(batch_sizes, device),
+            *phrase_cases(),
+            *merge_cases(workdir),
+        ]
+        results = run_cases(cases, repeat=args.repeat, warmup=args.warmup, only=args.only)
+
+    out = args.out or os.path.join(REPO_ROOT, "benchmarks", "results", f"{git_commit()}.json")
+    write_results(out, results)
+
+    if args.compare:
+        regressions = compare(load_results(args.compare), load_results(out), args.threshold, only=args.only)
+        if regressions:
+            failed = sum(current_ms is None for _, _, current_ms, _ in regressions)
+            print(f"\n{len(regressions) - failed} case(s) regressed by more than {args.threshold:.0%}, "
+                  f"{failed} errored or missing")
+            sys.exit(1)
+        print("\nNo regressions")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Local stand-in for the parts of the Cloudinary API the server and app use.
+
+Implements upload, destroy, rename, the Admin API resource listing (prefix,
+max_results, next_cursor, direction) and media delivery, so the server can be
+exercised end to end without touching the real account. Like the real API,
+a listing with a prefix is ordered by public_id and ignores direction:
+
+    python loadtest/fake_cloudinary.py --port 8901
+    CLOUDINARY_UPLOAD_PREFIX=http://127.0.0.1:8901 CLOUDINARY_CLOUD_NAME=fake \\
+        CLOUDINARY_API_KEY=fake CLOUDINARY_API_SECRET=fake python Flask_server/server.py
+"""
+import argparse
+import itertools
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from flask import Flask, request, jsonify, send_file, abort
+
+app = Flask(__name__)
+
+STORAGE_DIR = tempfile.mkdtemp(prefix="fake_cloudinary_")
+LATENCY_SECONDS = 0.0  # Simulated network latency per API call
+
+resources = {}  # public_id -> resource dict
+resources_lock = threading.Lock()
+upload_sequence = itertools.count()
+stats = {"upload": 0, "destroy": 0, "rename": 0, "list": 0, "download": 0}
+
+def _simulate_latency(kind):
+    with resources_lock:
+        stats[kind] += 1
+    if LATENCY_SECONDS:
+        time.sleep(LATENCY_SECONDS)
+
+def _created_at():
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def add_resource(public_id, data, fmt, resource_type="video", created_at=None, fail_status=None):
+    """Store a resource directly; also used by harness scripts to seed the fake (fail_status: HTTP status its media returns)."""
+    local_name = f"{uuid.uuid4().hex}.{fmt}"
+    with open(os.path.join(STORAGE_DIR, local_name), "wb") as f:
+        f.write(data)
+    resource = {
+        "public_id": public_id,
+        "format": fmt,
+        "resource_type": resource_type,
+        "type": "upload",
+        "created_at": created_at or _created_at(),
+        "bytes": len(data),
+        "_local_name": local_name,
+        "_sequence": next(upload_sequence),
+        "_fail_status": fail_status,
+    }
+    with resources_lock:
+        resources[public_id] = resource
+    return resource
+
+def _public(resource):
+    base = request.host_url.rstrip("/")
+    cloud = request.view_args.get("cloud_name", "fake") if request.view_args else "fake"
+    url = f"{base}/media/{cloud}/{resource['resource_type']}/upload/{resource['public_id']}.{resource['format']}"
+    result = {k: v for k, v in resource.items() if not k.startswith("_")}
+    result.update({"url": url, "secure_url": url})
+    return result
+
+@app.route('/v1_1/<cloud_name>/<resource_type>/upload', methods=['POST'])
+def upload(cloud_name, resource_type):
+    _simulate_latency("upload")
+    upload_file = request.files.get("file")
+    if upload_file is None:
+        return jsonify({"error": {"message": "Missing required parameter - file"}}), 400
+
+    public_id = request.form.get("public_id") or uuid.uuid4().hex[:20]
+    folder = request.form.get("folder")
+    if folder and not public_id.startswith(folder.rstrip("/") + "/"):
+        public_id = f"{folder.rstrip('/')}/{public_id}"
+    fmt = os.path.splitext(upload_file.filename or "")[1].lstrip(".").lower() or "mp4"
+
+    resource = add_resource(public_id, upload_file.read(), fmt, resource_type)
+    return jsonify(_public(resource))
+
+@app.route('/v1_1/<cloud_name>/<resource_type>/destroy', methods=['POST'])
+def destroy(cloud_name, resource_type):
+    _simulate_latency("destroy")
+    public_id = request.form.get("public_id") or (request.json or {}).get("public_id")
+    with resources_lock:
+        resource = resources.pop(public_id, None)
+    if resource is None:
+        return jsonify({"result": "not found"})
+    os.remove(os.path.join(STORAGE_DIR, resource["_local_name"]))
+    return jsonify({"result": "ok"})
+
+@app.route('/v1_1/<cloud_name>/<resource_type>/rename', methods=['POST'])
+def rename(cloud_name, resource_type):
+    _simulate_latency("rename")
+    params = request.form if request.form else (request.json or {})
+    from_public_id, to_public_id = params.get("from_public_id"), params.get("to_public_id")
+    overwrite = str(params.get("overwrite", "")).lower() in ("1", "true")
+    with resources_lock:
+        if from_public_id not in resources:
+            return jsonify({"error": {"message": f"Resource not found - {from_public_id}"}}), 404
+        if to_public_id in resources and not overwrite:
+            return jsonify({"error": {"message": f"to_public_id {to_public_id} already exists"}}), 400
+        resource = resources.pop(from_public_id)
+        resource["public_id"] = to_public_id
+        resources[to_public_id] = resource
+    return jsonify(_public(resource))
+
+@app.route('/v1_1/<cloud_name>/resources/<resource_type>', methods=['GET'])
+@app.route('/v1_1/<cloud_name>/resources/<resource_type>/<delivery_type>', methods=['GET'])
+def list_resources(cloud_name, resource_type, delivery_type="upload"):
+    _simulate_latency("list")
+    prefix = request.args.get("prefix", "")
+    max_results = min(int(request.args.get("max_results", 10)), 500)
+    offset = int(request.args.get("next_cursor") or 0)
+    ascending = request.args.get("direction", "desc") in ("asc", "1")
+
+    with resources_lock:
+        matching = [r for r in resources.values()
+                    if r["resource_type"] == resource_type and r["public_id"].startswith(prefix)]
+    if prefix:
+        matching.sort(key=lambda r: r["public_id"])
+    else:
+        matching.sort(key=lambda r: (r["created_at"], r["_sequence"]), reverse=not ascending)
+
+    page = matching[offset:offset + max_results]
+    body = {"resources": [_public(r) for r in page]}
+    if offset + max_results < len(matching):
+        body["next_cursor"] = str(offset + max_results)
+    return jsonify(body)
+
+@app.route('/media/<cloud_name>/<resource_type>/upload/<path:filename>', methods=['GET'])
+def media(cloud_name, resource_type, filename):
+    _simulate_latency("download")
+    public_id = os.path.splitext(filename)[0]
+    with resources_lock:
+        resource = resources.get(public_id)
+    if resource is None:
+        abort(404)
+    if resource["_fail_status"]:
+        abort(resource["_fail_status"])
+    return send_file(os.path.join(STORAGE_DIR, resource["_local_name"]))
+
+@app.route('/_fake/stats', methods=['GET'])
+def fake_stats():
+    with resources_lock:
+        return jsonify({"calls": dict(stats), "resources": len(resources)})
+
+@app.route('/_fake/reset', methods=['POST'])
+def fake_reset():
+    with resources_lock:
+        resources.clear()
+        for key in stats:
+            stats[key] = 0
+    shutil.rmtree(STORAGE_DIR, ignore_errors=True)
+    os.makedirs(STORAGE_DIR, exist_ok=True)
+    return jsonify({"status": "success"})
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run a local fake of the Cloudinary API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8901)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Simulated latency added to every call")
+    args = parser.parse_args()
+
+    LATENCY_SECONDS = args.latency_ms / 1000
+    print(f"Fake Cloudinary storing media in {STORAGE_DIR}")
+    app.run(host=args.host, port=args.port, threaded=True)
@@ -0,0 +1,154 @@
+"""
+Simulate concurrent app clients against a running server.
+
+Each client repeatedly runs one of the two app workflows:
+
+* sign:  upload a clip to Cloudinary's `sign-to-text/` folder, then poll
+         `/translation/<public_id>` every `--poll-interval` seconds until the
+         server reports the result for that upload
+* text:  POST `/text-to-sign` and wait for the generated video URL
+
+Point --cloudinary at loadtest/fake_cloudinary.py (and the server at the same
+fake via CLOUDINARY_UPLOAD_PREFIX) to keep the real account out of the loop.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+import requests
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SENTENCES = ["how are you", "i am sad", "hello how are you", "thank you", "i am happy"]
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, int(round(q / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+def run_sign_workflow(args, video_bytes):
+    public_id = f"load_{uuid.uuid4().hex[:12]}"
+    response = requests.post(
+        f"{args.cloudinary}/v1_1/{args.cloud_name}/video/upload",
+        files={"file": ("video.mp4", video_bytes, "video/mp4")},
+        data={"upload_preset": "video_upload", "public_id": public_id, "folder": "sign-to-text"},
+        timeout=args.timeout,
+    )
+    response.raise_for_status()
+    uploaded_id = response.json()["public_id"]
+
+    deadline = time.monotonic() + args.timeout
+    while time.monotonic() < deadline:
+        time.sleep(args.poll_interval)
+        response = requests.get(f"{args.server}/translation/{uploaded_id}", timeout=args.timeout)
+        if response.status_code == 404:
+            continue  # Not processed yet
+        response.raise_for_status()
+        data = response.json()
+        if data.get("result") != "ok":
+            raise RuntimeError(f"translation of {uploaded_id} failed: {data.get('text')}")
+        return
+    raise TimeoutError(f"no translation for {uploaded_id} within {args.timeout}s")
+
+def run_text_workflow(args, sentence):
+    response = requests.post(f"{args.server}/text-to-sign", json={"text": sentence}, timeout=args.timeout)
+    data = response.json()
+    if response.status_code != 200 or data.get("status") != "success":
+        raise RuntimeError(data.get("message", f"HTTP {response.status_code}"))
+
+def client_loop(args, video_bytes, stop_at, records, lock, seed):
+    rng = random.Random(seed)
+    while time.monotonic() < stop_at:
+        workflow = "sign" if rng.random() < args.sign_ratio else "text"
+        start = time.monotonic()
+        error = None
+        try:
+            if workflow == "sign":
+                run_sign_workflow(args, video_bytes)
+            else:
+                run_text_workflow(args, rng.choice(SENTENCES))
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        with lock:
+            records.append({"workflow": workflow, "latency_s": time.monotonic() - start, "error": error})
+
+def summarise(records, elapsed):
+    ok = sorted(r["latency_s"] for r in records if r["error"] is None)
+    total = len(records)
+    return {
+        "requests": total,
+        "errors": total - len(ok),
+        "error_rate": (total - len(ok)) / total if total else 0.0,
+        "throughput_rps": len(ok) / elapsed if elapsed else 0.0,
+        "p50_s": percentile(ok, 50),
+        "p95_s": percentile(ok, 95),
+        "p99_s": percentile(ok, 99),
+    }
+
+def run_level(args, concurrency, video_bytes):
+    records, lock = [], threading.Lock()
+    start = time.monotonic()
+    stop_at = start + args.duration
+    threads = [threading.Thread(target=client_loop, args=(args, video_bytes, stop_at, records, lock, i))
+               for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - start
+
+    level = {"concurrency": concurrency, "elapsed_s": elapsed, "overall": summarise(records, elapsed)}
+    for workflow in ("sign", "text"):
+        level[workflow] = summarise([r for r in records if r["workflow"] == workflow], elapsed)
+    level["sample_errors"] = sorted({r["error"] for r in records if r["error"]})[:5]
+    return level
+
+def _fmt(seconds):
+    return f"{seconds * 1000:.0f}" if seconds is not None else "-"
+
+def print_level(level):
+    for name in ("overall", "sign", "text"):
+        row = level[name]
+        print(f"{level['concurrency']:>5} {name:<8}{row['requests']:>8}{row['throughput_rps']:>10.2f}"
+              f"{row['error_rate'] * 100:>9.1f}%{_fmt(row['p50_s']):>9}{_fmt(row['p95_s']):>9}{_fmt(row['p99_s']):>9}")
+
+def default_video():
+    sys.path.insert(0, os.path.join(REPO_ROOT, "benchmarks"))
+    from fixtures import ensure_clips
+    return ensure_clips([(640, 480)], [90])[(640, 480, 90)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the sign translation server with simulated app clients.")
+    parser.add_argument("--server", default="http://127.0.0.1:5000")
+    parser.add_argument("--cloudinary", default="http://127.0.0.1:8901", help="Base URL of the (fake) Cloudinary API")
+    parser.add_argument("--cloud-name", default="fake")
+    parser.add_argument("--concurrency", default="1,2,4,8,16", help="Comma-separated client counts to step through")
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds to run each concurrency level")
+    parser.add_argument("--sign-ratio", type=float, default=0.5, help="Fraction of runs that are sign-to-text uploads")
+    parser.add_argument("--poll-interval", type=float, default=2.0)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--video", help="Clip to upload (default: a generated synthetic fixture)")
+    parser.add_argument("--out", default="loadtest_results.json")
+    args = parser.parse_args()
+
+    with open(args.video or default_video(), "rb") as f:
+        video_bytes = f.read()
+
+    print(f"{'conc':>5} {'flow':<8}{'reqs':>8}{'req/s':>10}{'errors':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    levels = []
+    for concurrency in [int(c) for c in args.concurrency.split(",")]:
+        level = run_level(args, concurrency, video_bytes)
+        print_level(level)
+        levels.append(level)
+
+    with open(args.out, "w") as f:
+        json.dump({"server": args.server, "levels": levels}, f, indent=2)
+    print(f"Results written to {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Check the server's incremental Cloudinary listing against the local fake.
+
+Seeds the fake with a sign-to-text backlog buried under newer text-to-sign
+outputs, then checks that:
+
+* the old whole-account listing (max_results=30) misses the backlog
+* the prefix-filtered, cursor-paged listing finds all of it, oldest first
+* a repeat poll with nothing new costs a single call
+* uploads sharing the watermark's second are still picked up
+* a failed upload is listed again until the watermark moves past it
+* a download that keeps failing is given up on after its attempts, counts
+  as idle for the poll interval, does not hold back later uploads and is
+  moved out of the folder
+* an old upload left in the folder, sorting before newer ones by
+  public_id, does not hide them (prefix listings ignore `direction`)
+
+    python loadtest/verify_listing.py
+"""
+import argparse
+import logging
+import os
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+
+import cloudinary
+import cloudinary.api
+import cloudinary.uploader
+import requests
+from werkzeug.serving import make_server
+
+import fake_cloudinary
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "Flask_server"))
+from cloudinary_poll import (UploadWatermark, RetryCounter, AdaptiveInterval, list_new_uploads,  # noqa: E402
+                             process_new_uploads)
+
+BASE_TIME = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+def timestamp(seconds):
+    return (BASE_TIME + timedelta(seconds=seconds)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def seed(public_id, seconds, fail_status=None):
+    fake_cloudinary.add_resource(public_id, b"\0" * 16, "mp4", created_at=timestamp(seconds), fail_status=fail_status)
+
+def download(resource):
+    """Stand-in for the server's process_sign_upload: fetch, then delete on success."""
+    if requests.get(resource["secure_url"]).status_code != 200:
+        return False
+    cloudinary.uploader.destroy(resource["public_id"], resource_type="video")
+    return True
+
+def list_calls():
+    return fake_cloudinary.stats["list"]
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify incremental Cloudinary listing against the local fake.")
+    parser.add_argument("--backlog", type=int, default=12, help="sign-to-text uploads waiting")
+    parser.add_argument("--outputs", type=int, default=60, help="Newer text-to-sign outputs burying them")
+    parser.add_argument("--page-size", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)  # Quiet the fake's request log
+    server = make_server("127.0.0.1", 0, fake_cloudinary.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    cloudinary.config(cloud_name="fake", api_key="fake", api_secret="fake",
+                      upload_prefix=f"http://127.0.0.1:{server.server_port}")
+
+    failures = []
+
+    def check(name, condition, detail=""):
+        print(f"{'PASS' if condition else 'FAIL'}  {name}{'  ' + detail if detail else ''}")
+        if not condition:
+            failures.append(name)
+
+    backlog = [f"sign-to-text/clip_{i:03d}" for i in range(args.backlog)]
+    for i, public_id in enumerate(backlog):
+        seed(public_id, i)
+    for i in range(args.outputs):
+        seed(f"text-to-sign/text_to_sign_{i:03d}", 1000 + i)
+
+    legacy = cloudinary.api.resources(resource_type="video", max_results=30)["resources"]
+    legacy_found = sum(r["public_id"].startswith("sign-to-text/") for r in legacy)
+    check("whole-account listing misses the backlog", legacy_found < len(backlog),
+          f"({legacy_found}/{len(backlog)} found in the first 30)")
+
+    watermark = UploadWatermark()
+    before = list_calls()
+    found, pages = list_new_uploads(watermark, page_size=args.page_size)
+    ids = [r["public_id"] for r in found]
+    check("prefix listing finds the whole backlog oldest first", ids == backlog,
+          f"({len(ids)} found over {pages} pages, {list_calls() - before} calls)")
+    for resource in found:
+        download(resource)
+        watermark.advance(resource)
+
+    before = list_calls()
+    found, pages = list_new_uploads(watermark, page_size=args.page_size)
+    check("idle poll costs one call", not found and list_calls() - before == 1,
+          f"({len(found)} found, {list_calls() - before} calls)")
+
+    # Same second as the current mark, then one later
+    seed("sign-to-text/same_second", args.backlog - 1)
+    seed("sign-to-text/later", args.backlog + 5)
+    found, _ = list_new_uploads(watermark, page_size=args.page_size)
+    ids = [r["public_id"] for r in found]
+    check("uploads at the watermark's second are picked up", ids == ["sign-to-text/same_second", "sign-to-text/later"],
+          f"({ids})")
+
+    # The server leaves a failed download in place and does not advance past it
+    found, _ = list_new_uploads(watermark, page_size=args.page_size)
+    check("unhandled uploads are listed again", len(found) == 2)
+    for resource in found:
+        download(resource)
+        watermark.advance(resource)
+    found, _ = list_new_uploads(watermark, page_size=args.page_size)
+    check("handled uploads are not listed again", not found)
+
+    interval = AdaptiveInterval(min_seconds=10, max_seconds=60)
+    schedule = [interval.record(found) for found in (False, False, False, False, False, True, False)]
+    check("poll interval backs off when idle and tightens on uploads", schedule == [20, 40, 60, 60, 60, 10, 20],
+          f"({schedule})")
+
+    # A download that always fails, ahead of one that works: polled like scheduled_poll does
+    seed("sign-to-text/broken", args.backlog + 10, fail_status=500)
+    seed("sign-to-text/after_broken", args.backlog + 11)
+    retries = RetryCounter(max_attempts=3)
+    interval = AdaptiveInterval(min_seconds=10, max_seconds=60)
+    before = fake_cloudinary.stats["download"]
+    handled, schedule = [], []
+    for _ in range(retries.max_attempts + 1):
+        found, _ = list_new_uploads(watermark, page_size=args.page_size)
+        handled.append(process_new_uploads(found, watermark, retries, download))
+        schedule.append(interval.record(handled[-1] > 0))
+    broken_attempts = fake_cloudinary.stats["download"] - before - 1
+    check("a failing upload is given up on after its attempts", broken_attempts == retries.max_attempts,
+          f"({broken_attempts} attempts)")
+    check("only handled uploads count as activity", handled == [1, 0, 0, 0] and schedule == [10, 20, 40, 60],
+          f"(handled {handled}, intervals {schedule})")
+    found, _ = list_new_uploads(watermark, page_size=args.page_size)
+    check("the watermark moves past a given-up upload", not found, f"({[r['public_id'] for r in found]})")
+    check("a given-up upload is moved out of the folder",
+          "sign-to-text-failed/broken" in fake_cloudinary.resources and "sign-to-text/broken" not in fake_cloudinary.resources)
+
+    # App uploads are named sign_<ms>: one left behind below the mark sorts ahead of every newer one
+    seed("sign-to-text/sign_1735689600000", 0)
+    seed("sign-to-text/sign_1735689700000", args.backlog + 20)
+    found, _ = list_new_uploads(watermark, page_size=args.page_size)
+    ids = [r["public_id"] for r in found]
+    check("an old upload left in the folder does not hide newer ones", ids == ["sign-to-text/sign_1735689700000"],
+          f"({ids})")
+
+    server.shutdown()
+    if failures:
+        print(f"\n{len(failures)} check(s) failed")
+        sys.exit(1)
+    print("\nAll listing checks passed")
+
+if __name__ == "__main__":
+    main()